@@ -1,29 +1,189 @@
 """
 Flask REST API for Sentiment Analyzer
 """
-from flask import Flask, request, jsonify
+from flask import (
+    Blueprint, Flask, Response, current_app, g, request, jsonify, send_file, stream_with_context
+)
 from flask_cors import CORS
-from core.analyzer import UniversalWSDAnalyzer
+from config import Config
+from services import Services
 from modules.validator import InputValidator
-from modules.url_extractor import URLTextExtractor
+from modules.batch_summary import BatchSummary
+from modules.json_provider import FastJSONProvider, dumps
+import hmac
 import logging
+import time
+import uuid
 from datetime import datetime
 
-app = Flask(__name__)
-CORS(app)
-
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize analyzer
-analyzer = UniversalWSDAnalyzer()
+api = Blueprint('api', __name__)
 validator = InputValidator()
-url_extractor = URLTextExtractor()
+
+
+def create_app(config=Config, warm_up=False):
+    """
+    Build the Flask app. Subsystems are created lazily by Services;
+    pass warm_up=True (or call services.warm_up()) to load them before
+    serving traffic.
+    """
+    start = time.perf_counter()
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config.from_object(config)
+    CORS(app)
+    app.register_blueprint(api)
+
+    services = Services(app.config)
+    app.extensions['services'] = services
+    app.json.metrics = services.metrics
+    services.startup['create_app_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+    if app.config['PROFILING_ENABLED'] and not app.config['PROFILING_TOKEN']:
+        logger.warning("PROFILING_ENABLED is set without PROFILING_TOKEN; profiling is refused")
+
+    if warm_up:
+        services.warm_up()
+    return app
+
+
+def get_services():
+    """Services of the current app"""
+    return current_app.extensions['services']
+
+
+def analyze_page(url, page_text):
+    """Analyze extracted page text (long pages in long-document mode)"""
+    services = get_services()
+    with services.cpu_slot():
+        if len(page_text) > current_app.config['LONG_DOCUMENT_CHARS']:
+            # Chunked analysis keeps worker memory flat on very long pages
+            result = services.analyzer.analyze_long_document(page_text)
+        else:
+            result = services.analyzer.analyze(page_text, mode='general')
+
+    result['source_url'] = url
+    result['snippet'] = " ".join(page_text.split()[:60]) + "..."
+    return result
+
+
+def view_options(source):
+    """Read detail / fields projection options, or None if invalid"""
+    detail = source.get('detail', 'full')
+    fields = source.get('fields')
+    if not validator.validate_view(detail, fields):
+        return None
+    return {'detail': detail, 'fields': fields}
+
+
+def ambiguous_option(source):
+    """Read the ambiguous_only flag, or None if it is not a boolean"""
+    value = source.get('ambiguous_only', False)
+    return value if validator.validate_flag(value) else None
+
+# ============= METRICS =============
+
+@api.before_app_request
+def start_timer():
+    metrics = get_services().metrics
+    if metrics is not None:
+        g.request_start = time.perf_counter()
+        metrics.bind(endpoint=request.endpoint or 'unknown')
+
+
+@api.after_app_request
+def record_request(response):
+    metrics = get_services().metrics
+    if metrics is not None and 'request_start' in g:
+        # Streaming responses are timed up to the first byte
+        metrics.observe_request(
+            request.endpoint or 'unknown', request.method, response.status_code,
+            time.perf_counter() - g.request_start
+        )
+    return response
+
+
+@api.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus metrics"""
+    metrics = get_services().metrics
+    if metrics is None:
+        return jsonify({'error': 'Metrics are disabled', 'success': False}), 404
+    return Response(metrics.render(), content_type=metrics.registry.CONTENT_TYPE)
+
+# ============= PROFILING =============
+
+def profiling_allowed():
+    """Profiling is enabled and the request carries the right token"""
+    if not current_app.config['PROFILING_ENABLED']:
+        return False
+    token = current_app.config['PROFILING_TOKEN']
+    if not token:
+        # Profiles expose code paths and timings: never serve them without a token
+        return False
+    supplied = request.headers.get('X-Profile-Token', '')
+    return hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+@api.before_app_request
+def start_profile():
+    """Profile this request when it asks with X-Profile: pstats|collapsed"""
+    kind = request.headers.get('X-Profile')
+    if not kind or not (request.endpoint or '').startswith('api.analyze'):
+        return None
+    if not current_app.config['PROFILING_ENABLED']:
+        return None
+    if not profiling_allowed():
+        return jsonify({'error': 'Profiling not allowed', 'success': False}), 403
+
+    if kind in ('1', 'true'):
+        kind = 'pstats'
+    # Generated here, so no caller can overwrite another caller's profile
+    profile_id = uuid.uuid4().hex
+    try:
+        g.profile = get_services().profiler.start(profile_id, kind)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'success': False}), 400
+    return None
+
+
+@api.after_app_request
+def stop_profile(response):
+    session = g.pop('profile', None)
+    if session is not None:
+        # Streaming bodies are produced after this point and not profiled
+        session.stop()
+        response.headers['X-Profile-Id'] = session.profile_id
+        response.headers['X-Profile-Format'] = session.kind
+    return response
+
+
+@api.teardown_app_request
+def discard_profile(error=None):
+    session = g.pop('profile', None)
+    if session is not None:
+        session.stop()
+
+
+@api.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Download a stored request profile"""
+    if not profiling_allowed():
+        return jsonify({'error': 'Profiling not allowed', 'success': False}), 403
+    found = get_services().profiler.find(profile_id)
+    if found is None:
+        return jsonify({'error': 'Profile not found', 'success': False}), 404
+    path, kind = found
+    mimetype = 'text/plain' if kind == 'collapsed' else 'application/octet-stream'
+    return send_file(path, mimetype=mimetype, as_attachment=True,
+                     download_name=f'{profile_id}.{kind}')
 
 # ============= ROOT ENDPOINT =============
 
-@app.route('/', methods=['GET'])
+@api.route('/', methods=['GET'])
 def root():
     """Root endpoint - API info"""
     return jsonify({
@@ -35,15 +195,22 @@ def root():
             'analyze_product': 'POST /api/analyze-product',
             'analyze_social': 'POST /api/analyze-social',
             'analyze_url': 'POST /api/analyze-url',
+            'analyze_urls': 'POST /api/analyze-urls',
             'batch': 'POST /api/analyze-batch',
+            'stream': 'POST /api/analyze-stream',
+            'sessions': 'POST /api/sessions',
+            'session_edits': 'POST /api/sessions/<id>/edits',
+            'session': 'GET|DELETE /api/sessions/<id>',
             'health': 'GET /api/health',
+            'metrics': 'GET /api/metrics',
+            'profiles': 'GET /api/profiles/<id>',
             'version': 'GET /api/version'
         }
     }), 200
 
 # ============= ANALYSIS ENDPOINTS =============
 
-@app.route('/api/analyze', methods=['POST'])
+@api.route('/api/analyze', methods=['POST'])
 def analyze_general():
     """General sentiment analysis"""
     try:
@@ -53,7 +220,19 @@ def analyze_general():
         if not validator.validate_text(text):
             return jsonify({'error': 'Invalid text', 'success': False}), 400
 
-        result = analyzer.analyze(text, mode='general')
+        view = view_options(data)
+        if view is None:
+            return jsonify({'error': 'Invalid detail or fields', 'success': False}), 400
+
+        ambiguous_only = ambiguous_option(data)
+        if ambiguous_only is None:
+            return jsonify({'error': 'Invalid ambiguous_only', 'success': False}), 400
+
+        result = get_services().analyzer.analyze(
+            text, mode='general',
+            ambiguous_only=ambiguous_only,
+            **view
+        )
         logger.info(f"Analyzed: {text[:30]}...")
 
         return jsonify({
@@ -67,7 +246,7 @@ def analyze_general():
         return jsonify({'error': str(e), 'success': False}), 500
 
 
-@app.route('/api/analyze-product', methods=['POST'])
+@api.route('/api/analyze-product', methods=['POST'])
 def analyze_product():
     """Product review analysis"""
     try:
@@ -77,7 +256,25 @@ def analyze_product():
         if not validator.validate_text(text):
             return jsonify({'error': 'Invalid text', 'success': False}), 400
 
-        result = analyzer.analyze(text, mode='product')
+        services = get_services()
+        category = data.get('category')
+        if category is not None and category not in services.analyzer.aspect_index.categories():
+            return jsonify({'error': 'Unknown category', 'success': False}), 400
+
+        view = view_options(data)
+        if view is None:
+            return jsonify({'error': 'Invalid detail or fields', 'success': False}), 400
+
+        ambiguous_only = ambiguous_option(data)
+        if ambiguous_only is None:
+            return jsonify({'error': 'Invalid ambiguous_only', 'success': False}), 400
+
+        result = services.analyzer.analyze(
+            text, mode='product',
+            ambiguous_only=ambiguous_only,
+            category=category,
+            **view
+        )
         logger.info(f"Product analysis: {text[:30]}...")
 
         return jsonify({
@@ -91,7 +288,7 @@ def analyze_product():
         return jsonify({'error': str(e), 'success': False}), 500
 
 
-@app.route('/api/analyze-social', methods=['POST'])
+@api.route('/api/analyze-social', methods=['POST'])
 def analyze_social():
     """Social media analysis"""
     try:
@@ -101,7 +298,19 @@ def analyze_social():
         if not validator.validate_text(text):
             return jsonify({'error': 'Invalid text', 'success': False}), 400
 
-        result = analyzer.analyze(text, mode='social')
+        view = view_options(data)
+        if view is None:
+            return jsonify({'error': 'Invalid detail or fields', 'success': False}), 400
+
+        ambiguous_only = ambiguous_option(data)
+        if ambiguous_only is None:
+            return jsonify({'error': 'Invalid ambiguous_only', 'success': False}), 400
+
+        result = get_services().analyzer.analyze(
+            text, mode='social',
+            ambiguous_only=ambiguous_only,
+            **view
+        )
         logger.info(f"Social analysis: {text[:30]}...")
 
         return jsonify({
@@ -115,7 +324,7 @@ def analyze_social():
         return jsonify({'error': str(e), 'success': False}), 500
 
 
-@app.route('/api/analyze-batch', methods=['POST'])
+@api.route('/api/analyze-batch', methods=['POST'])
 def analyze_batch():
     """Batch analysis"""
     try:
@@ -125,15 +334,31 @@ def analyze_batch():
         if not validator.validate_texts(texts):
             return jsonify({'error': 'Invalid texts', 'success': False}), 400
 
-        results = []
-        for text in texts:
-            result = analyzer.analyze(text, mode='general')
-            results.append(result)
+        view = view_options(data)
+        if view is None:
+            return jsonify({'error': 'Invalid detail or fields', 'success': False}), 400
 
-        positive = len([r for r in results if r.get('sentiment') == 'POSITIVE'])
-        negative = len([r for r in results if r.get('sentiment') == 'NEGATIVE'])
-        neutral = len([r for r in results if r.get('sentiment') == 'NEUTRAL'])
-        avg_confidence = sum(r.get('confidence', 0) for r in results) / len(results)
+        ambiguous_only = ambiguous_option(data)
+        if ambiguous_only is None:
+            return jsonify({'error': 'Invalid ambiguous_only', 'success': False}), 400
+
+        max_batch = current_app.config['MAX_BATCH_SIZE']
+        if len(texts) > max_batch:
+            return jsonify({
+                'error': f'Too many texts (max {max_batch})',
+                'success': False
+            }), 413
+
+        results = get_services().analyzer.analyze_many(
+            texts, mode='general',
+            workers=current_app.config['BATCH_WORKERS'],
+            ambiguous_only=ambiguous_only,
+            **view
+        )
+
+        summary = BatchSummary()
+        for result in results:
+            summary.add(result)
 
         logger.info(f"Batch: {len(results)} texts")
 
@@ -141,12 +366,7 @@ def analyze_batch():
             'success': True,
             'total': len(results),
             'results': results,
-            'summary': {
-                'positive': positive,
-                'negative': negative,
-                'neutral': neutral,
-                'average_confidence': round(avg_confidence, 2)
-            },
+            'summary': summary.to_dict(),
             'timestamp': datetime.now().isoformat()
         }), 200
 
@@ -155,7 +375,82 @@ def analyze_batch():
         return jsonify({'error': str(e), 'success': False}), 500
 
 
-@app.route('/api/analyze-url', methods=['POST'])
+@api.route('/api/analyze-stream', methods=['POST'])
+def analyze_stream():
+    """
+    Streaming NDJSON analysis.
+    Request body: one JSON text per line, either a string or an object
+    with "text" (and optional "id"). Response: one NDJSON result per input
+    line as it is scored, then a trailer line with the running summary.
+    """
+    mode = request.args.get('mode', 'general')
+    if mode not in ('general', 'product', 'social'):
+        return jsonify({'error': f'Unknown mode: {mode}', 'success': False}), 400
+
+    view = view_options(request.args)
+    if view is None:
+        return jsonify({'error': 'Invalid detail or fields', 'success': False}), 400
+
+    max_line = current_app.config['MAX_STREAM_LINE_BYTES']
+    services = get_services()
+    stream = request.stream
+
+    def read_lines():
+        """Yield (line, too_long) without buffering more than one line"""
+        while True:
+            line = stream.readline(max_line + 1)
+            if not line:
+                return
+            if len(line) > max_line and not line.endswith(b'\n'):
+                # Discard the rest of the oversized line
+                while line and not line.endswith(b'\n'):
+                    line = stream.readline(max_line + 1)
+                yield b'', True
+            else:
+                yield line, False
+
+    def parse(line):
+        """Return (id, result) for one input line"""
+        try:
+            item = current_app.json.loads(line)
+        except ValueError:
+            return None, {'error': 'Invalid JSON', 'success': False}
+        item_id, text = None, item
+        if isinstance(item, dict):
+            item_id, text = item.get('id'), item.get('text')
+        if not validator.validate_text(text):
+            return item_id, {'error': 'Invalid text', 'success': False}
+        with services.cpu_slot():
+            return item_id, services.analyzer.analyze_one(text.strip(), mode=mode, **view)
+
+    def generate():
+        summary = BatchSummary()
+        for line_no, (line, too_long) in enumerate(read_lines(), 1):
+            if too_long:
+                item_id, result = None, {'error': 'Line too long', 'success': False}
+            elif not line.strip():
+                continue
+            else:
+                item_id, result = parse(line)
+
+            summary.add(result)
+            record = {'line': line_no, **result}
+            if item_id is not None:
+                record['id'] = item_id
+            yield dumps(record) + '\n'
+
+        logger.info(f"Stream: {summary.total} texts")
+        yield dumps({
+            'success': True,
+            'total': summary.total,
+            'summary': summary.to_dict(),
+            'timestamp': datetime.now().isoformat()
+        }) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@api.route('/api/analyze-url', methods=['POST'])
 def analyze_url():
     """
     NEW: URL-based analysis.
@@ -170,7 +465,7 @@ def analyze_url():
         if not url:
             return jsonify({'error': 'No URL provided', 'success': False}), 400
 
-        page_text = url_extractor.extract_from_url(url)
+        page_text = get_services().url_extractor.extract_from_url(url)
 
         if not page_text or len(page_text.split()) < 20:
             return jsonify({
@@ -178,12 +473,9 @@ def analyze_url():
                 'success': False
             }), 400
 
-        result = analyzer.analyze(page_text, mode='general')
+        result = analyze_page(url, page_text)
         logger.info(f"URL analysis: {url} -> {page_text[:30]}...")
 
-        result['source_url'] = url
-        result['snippet'] = " ".join(page_text.split()[:60]) + "..."
-
         return jsonify({
             'success': result.get('success', True),
             'data': result,
@@ -194,19 +486,186 @@ def analyze_url():
         logger.error(f"URL analysis error: {str(e)}")
         return jsonify({'error': str(e), 'success': False}), 500
 
+
+@api.route('/api/analyze-urls', methods=['POST'])
+def analyze_urls():
+    """
+    Multi-URL analysis.
+    Pages are fetched concurrently (global and per-host limits) over a
+    pooled session and analyzed as they arrive. Each result reports
+    fetch, extract and analyze times.
+    """
+    try:
+        data = request.json or {}
+        urls = data.get('urls', [])
+
+        if not validator.validate_texts(urls):
+            return jsonify({'error': 'Invalid urls', 'success': False}), 400
+
+        max_urls = current_app.config['MAX_URLS']
+        if len(urls) > max_urls:
+            return jsonify({
+                'error': f'Too many urls (max {max_urls})',
+                'success': False
+            }), 413
+
+        results = get_services().url_batch.run([url.strip() for url in urls], analyze_page)
+
+        summary = BatchSummary()
+        for result in results:
+            summary.add(result.get('data', result))
+
+        logger.info(f"URL batch: {len(results)} urls")
+
+        return jsonify({
+            'success': True,
+            'total': len(results),
+            'results': results,
+            'summary': summary.to_dict(),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"URL batch error: {str(e)}")
+        return jsonify({'error': str(e), 'success': False}), 500
+
+# ============= LIVE-TYPING SESSIONS =============
+
+def session_body(session, word_breakdown=False):
+    """Response body with the session's current analysis"""
+    document = session.document
+    result = document.result()
+    if word_breakdown:
+        result['word_breakdown'] = document.word_breakdown()
+    return {
+        'success': True,
+        'session_id': session.id,
+        'version': document.version,
+        'data': result,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+@api.route('/api/sessions', methods=['POST'])
+def create_session():
+    """
+    Start an incremental (general mode) analysis session for a text that
+    will be edited, e.g. while the user types
+    """
+    try:
+        data = request.json or {}
+        text = data.get('text', '')
+
+        if not isinstance(text, str):
+            return jsonify({'error': 'Invalid text', 'success': False}), 400
+
+        max_chars = current_app.config['MAX_SESSION_CHARS']
+        if len(text) > max_chars:
+            return jsonify({
+                'error': f'Text too long (max {max_chars} characters)',
+                'success': False
+            }), 413
+
+        session = get_services().open_session(text)
+        return jsonify(session_body(session, data.get('word_breakdown'))), 201
+
+    except Exception as e:
+        logger.error(f"Session error: {str(e)}")
+        return jsonify({'error': str(e), 'success': False}), 500
+
+
+@api.route('/api/sessions/<session_id>/edits', methods=['POST'])
+def edit_session(session_id):
+    """
+    Apply edits to a session's text and return the updated analysis.
+
+    Body: {"edits": [{"offset", "delete", "insert"}, ...], "version"}.
+    Offsets count Unicode code points in the text after the previous
+    edit. ``version`` (optional) must match the session's current version,
+    so a client whose edits went missing gets 409 and starts over.
+    """
+    try:
+        data = request.json or {}
+        edits = data.get('edits')
+
+        if not validator.validate_edits(edits):
+            return jsonify({'error': 'Invalid edits', 'success': False}), 400
+
+        services = get_services()
+        session = services.sessions.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found', 'success': False}), 404
+
+        with session.lock:
+            document = session.document
+            version = data.get('version')
+            if version is not None and version != document.version:
+                return jsonify({
+                    'error': 'Version mismatch',
+                    'version': document.version,
+                    'success': False
+                }), 409
+
+            # Check every edit before applying any, so a bad batch changes nothing
+            length = len(document)
+            for edit in edits:
+                delete = edit.get('delete', 0)
+                if edit['offset'] + delete > length:
+                    return jsonify({'error': 'Edit range outside the text', 'success': False}), 400
+                length += len(edit.get('insert', '')) - delete
+            max_chars = current_app.config['MAX_SESSION_CHARS']
+            if length > max_chars:
+                return jsonify({
+                    'error': f'Text too long (max {max_chars} characters)',
+                    'success': False
+                }), 413
+
+            start = time.perf_counter()
+            with services.cpu_slot():
+                for edit in edits:
+                    document.edit(edit['offset'], edit.get('delete', 0), edit.get('insert', ''))
+            if services.metrics is not None:
+                services.metrics.observe_stage('session_edit', time.perf_counter() - start)
+            return jsonify(session_body(session, data.get('word_breakdown'))), 200
+
+    except Exception as e:
+        logger.error(f"Session edit error: {str(e)}")
+        return jsonify({'error': str(e), 'success': False}), 500
+
+
+@api.route('/api/sessions/<session_id>', methods=['GET'])
+def get_session(session_id):
+    """Current text and analysis of a session"""
+    session = get_services().sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Session not found', 'success': False}), 404
+    with session.lock:
+        body = session_body(session, request.args.get('word_breakdown') == '1')
+        body['text'] = session.document.text
+    return jsonify(body), 200
+
+
+@api.route('/api/sessions/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    """End a session"""
+    if not get_services().sessions.delete(session_id):
+        return jsonify({'error': 'Session not found', 'success': False}), 404
+    return jsonify({'success': True}), 200
+
 # ============= HEALTH ENDPOINTS =============
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health():
     """Health check"""
     return jsonify({
         'status': 'healthy',
         'version': '2.0',
+        'startup': get_services().startup,
         'timestamp': datetime.now().isoformat()
     }), 200
 
 
-@app.route('/api/version', methods=['GET'])
+@api.route('/api/version', methods=['GET'])
 def version():
     """API version"""
     return jsonify({
@@ -219,25 +678,33 @@ def version():
             'Batch processing',
             'Modern slang support',
             'Emoji processing',
-            'URL-based article analysis'
+            'URL-based article analysis',
+            'Incremental analysis sessions for live typing'
         ]
     }), 200
 
 # ============= ERROR HANDLERS =============
 
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found', 'success': False}), 404
 
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     logger.error(f"Internal error: {str(error)}")
     return jsonify({'error': 'Internal server error', 'success': False}), 500
 
+# ============= APP =============
+
+# WSGI entry point (gunicorn app:app); see gunicorn.conf.py for warm-up
+app = create_app()
+
 # ============= MAIN =============
 
 if __name__ == '__main__':
+    app.extensions['services'].warm_up()
+
     print("""
     ╔════════════════════════════════════════════════════════════╗
     ║   Universal WSD Sentiment Analyzer v2.0                   ║
@@ -250,8 +717,16 @@ if __name__ == '__main__':
     print("  POST /api/analyze-product")
     print("  POST /api/analyze-social")
     print("  POST /api/analyze-batch")
+    print("  POST /api/analyze-stream")
     print("  POST /api/analyze-url")
+    print("  POST /api/analyze-urls")
+    print("  POST /api/sessions")
+    print("  POST /api/sessions/<id>/edits")
+    print("  GET  /api/sessions/<id>")
+    print("  DELETE /api/sessions/<id>")
     print("  GET  /api/health")
+    print("  GET  /api/metrics")
+    print("  GET  /api/profiles/<id>")
     print("  GET  /api/version")
     print("\nServer running at http://localhost:5000")
 
@@ -0,0 +1,265 @@
+"""
+ASGI entry point - the same API served from an event loop
+
+    uvicorn asgi:app --workers 2
+
+Requests are dispatched to the Flask app on two thread pools, so the
+event loop itself never blocks:
+
+- cpu: the analysis endpoints. Few workers (ASGI_CPU_WORKERS) and a
+  short queue (ASGI_CPU_QUEUE); when both are full the request gets
+  503 with Retry-After instead of waiting.
+- io:  URL analysis, streaming, health and metrics. Many workers, so a
+  slow page fetch ties up one cheap thread rather than a server worker,
+  and cheap analyze calls never queue behind it.
+
+Analysis done by the io endpoints (page text, stream lines) takes one of
+the same ASGI_CPU_WORKERS slots, so total concurrent analysis stays
+bounded. Run more processes (--workers) to use more cores.
+"""
+import asyncio
+import json
+import logging
+import sys
+import threading
+
+from werkzeug.exceptions import HTTPException
+
+from app import create_app
+from config import Config
+from modules.executor import BoundedExecutor, Overloaded
+
+logger = logging.getLogger(__name__)
+
+# Analysis endpoints that also do network or client I/O
+IO_PATHS = ('/api/analyze-url', '/api/analyze-urls', '/api/analyze-stream')
+
+
+def build_environ(scope, body):
+    """WSGI environ for one ASGI http scope"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        # The body ends at the last ASGI message, with or without Content-Length
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            key = 'CONTENT_TYPE'
+        elif name == 'CONTENT_LENGTH':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class RequestBody:
+    """
+    File-like request body for a worker thread, pulled from the ASGI
+    ``receive`` channel on demand so large uploads are not buffered.
+    """
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = bytearray()
+        self._done = False
+
+    def _fill(self):
+        message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+        if message['type'] == 'http.request':
+            self._buffer += message.get('body', b'')
+            self._done = not message.get('more_body', False)
+        else:
+            self._done = True
+
+    def _take(self, size):
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read(self, size=-1):
+        while not self._done and (size is None or size < 0 or len(self._buffer) < size):
+            self._fill()
+        if size is None or size < 0:
+            size = len(self._buffer)
+        return self._take(size)
+
+    def readline(self, size=-1):
+        while True:
+            end = self._buffer.find(b'\n')
+            if end >= 0:
+                end += 1
+                break
+            if self._done or (size is not None and 0 <= size <= len(self._buffer)):
+                end = len(self._buffer)
+                break
+            self._fill()
+        if size is not None and size >= 0:
+            end = min(end, size)
+        return self._take(end)
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+class AsyncGateway:
+    """ASGI app that runs a WSGI app on bounded cpu / io executors"""
+
+    def __init__(self, wsgi_app, cpu_workers=4, cpu_queue=64, io_workers=64, io_queue=256):
+        self.wsgi_app = wsgi_app
+        self.cpu = BoundedExecutor(cpu_workers, cpu_queue, name='cpu')
+        self.io = BoundedExecutor(io_workers, io_queue, name='io')
+        self.services = wsgi_app.extensions['services']
+        # Shared by the cpu pool and analysis done on io threads
+        self.services.cpu_slots = threading.BoundedSemaphore(cpu_workers)
+        if self.services.metrics is not None:
+            self.services.metrics.add_executor('cpu', self.cpu.stats)
+            self.services.metrics.add_executor('io', self.io.stats)
+
+    def pool_for(self, path):
+        if path.startswith('/api/analyze') and path not in IO_PATHS:
+            return self.cpu
+        return self.io
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        loop = asyncio.get_running_loop()
+        pool = self.pool_for(scope['path'])
+        try:
+            future = pool.submit(self.handle, pool, scope, receive, send, loop)
+        except Overloaded:
+            await self.reject(scope, send)
+            return
+        await asyncio.wrap_future(future)
+
+    def endpoint(self, scope):
+        """Flask endpoint name for a request, as in the other metrics labels"""
+        adapter = self.wsgi_app.url_map.bind('localhost')
+        try:
+            endpoint, _ = adapter.match(scope['path'], method=scope['method'])
+        except HTTPException:
+            return 'unknown'
+        return endpoint
+
+    async def reject(self, scope, send):
+        if self.services.metrics is not None:
+            # Label by endpoint, not path: client-chosen paths must not add series
+            self.services.metrics.errors.inc(self.endpoint(scope), 'overloaded')
+        body = json.dumps({'error': 'Server overloaded, retry later', 'success': False}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', b'1'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    def handle(self, pool, scope, receive, send, loop):
+        """Run one request through the WSGI app on a pool thread"""
+        if pool is self.cpu:
+            with self.services.cpu_slots:
+                self.call_wsgi(scope, receive, send, loop)
+        else:
+            self.call_wsgi(scope, receive, send, loop)
+
+    def call_wsgi(self, scope, receive, send, loop):
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get('started'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        def start():
+            if not response.get('started'):
+                response['started'] = True
+                emit({
+                    'type': 'http.response.start',
+                    'status': response['status'],
+                    'headers': response['headers'],
+                })
+
+        environ = build_environ(scope, RequestBody(receive, loop))
+        body = self.wsgi_app(environ, start_response)
+        try:
+            for chunk in body:
+                if chunk:
+                    start()
+                    emit({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            start()
+            emit({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self.services.warm_up)
+                except Exception as e:
+                    logger.error(f"Warm-up failed: {str(e)}")
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.cpu.shutdown(wait=False)
+                self.io.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(config=Config):
+    """Build the Flask app and wrap it in an AsyncGateway"""
+    flask_app = create_app(config)
+    return AsyncGateway(
+        flask_app,
+        cpu_workers=flask_app.config['ASGI_CPU_WORKERS'],
+        cpu_queue=flask_app.config['ASGI_CPU_QUEUE'],
+        io_workers=flask_app.config['ASGI_IO_WORKERS'],
+        io_queue=flask_app.config['ASGI_IO_QUEUE']
+    )
+
+
+# ASGI entry point (uvicorn asgi:app); warm-up runs at lifespan startup
+app = create_asgi_app()
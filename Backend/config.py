@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 class Config:
     """Base configuration"""
@@ -6,6 +7,62 @@ class Config:
     TESTING = False
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
 
+    # Batch analysis
+    BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+    MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+    MAX_STREAM_LINE_BYTES = int(os.environ.get('MAX_STREAM_LINE_BYTES', 1024 * 1024))
+
+    # URL pages longer than this are analyzed in long-document mode
+    LONG_DOCUMENT_CHARS = int(os.environ.get('LONG_DOCUMENT_CHARS', 20000))
+
+    # Multi-URL analysis: total and per-host concurrent fetches
+    MAX_URLS = int(os.environ.get('MAX_URLS', 200))
+    URL_FETCH_WORKERS = int(os.environ.get('URL_FETCH_WORKERS', 16))
+    URL_FETCH_PER_HOST = int(os.environ.get('URL_FETCH_PER_HOST', 4))
+
+    # On-disk fetch cache for URL analysis (FETCH_CACHE_DIR='' disables it)
+    FETCH_CACHE_DIR = os.environ.get(
+        'FETCH_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'wsd-fetch-cache')
+    )
+    FETCH_CACHE_BYTES = int(os.environ.get('FETCH_CACHE_BYTES', 256 * 1024 * 1024))
+    FETCH_CACHE_TTL = int(os.environ.get('FETCH_CACHE_TTL', 3600))
+
+    # HTML parsing for URL extraction ('lxml' is used when installed)
+    HTML_PARSER = os.environ.get('HTML_PARSER', 'html.parser')
+    MAX_HTML_BYTES = int(os.environ.get('MAX_HTML_BYTES', 5 * 1024 * 1024))
+
+    # Word tokenizer: 'nltk' (word_tokenize) or 'fast' (regex, no NLTK data)
+    TOKENIZER = os.environ.get('TOKENIZER', 'nltk')
+
+    # Prometheus metrics at /api/metrics (METRICS_ENABLED=0 disables them)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+    # Opt-in request profiling (X-Profile header); off unless enabled,
+    # and the X-Profile-Token header must match PROFILING_TOKEN (required)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+    PROFILE_DIR = os.environ.get(
+        'PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'wsd-profiles')
+    )
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
+
+    # ASGI serving (uvicorn asgi:app): analysis threads and queue, and
+    # threads for URL fetches / streaming; full pools answer 503
+    ASGI_CPU_WORKERS = int(os.environ.get('ASGI_CPU_WORKERS', os.cpu_count() or 1))
+    ASGI_CPU_QUEUE = int(os.environ.get('ASGI_CPU_QUEUE', 64))
+    ASGI_IO_WORKERS = int(os.environ.get('ASGI_IO_WORKERS', 64))
+    ASGI_IO_QUEUE = int(os.environ.get('ASGI_IO_QUEUE', 256))
+
+    # Live-typing sessions (/api/sessions): kept in worker memory, dropped
+    # least recently used past SESSION_MAX or after SESSION_TTL idle seconds
+    SESSION_MAX = int(os.environ.get('SESSION_MAX', 1000))
+    SESSION_TTL = int(os.environ.get('SESSION_TTL', 1800))
+    MAX_SESSION_CHARS = int(os.environ.get('MAX_SESSION_CHARS', 100000))
+
+    # Result cache (RESULT_CACHE_SIZE=0 disables it)
+    RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 1024))
+    RESULT_CACHE_BYTES = int(os.environ.get('RESULT_CACHE_BYTES', 32 * 1024 * 1024))
+
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
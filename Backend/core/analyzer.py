@@ -3,92 +3,386 @@ Main Sentiment Analyzer with WSD Support
 """
 from .wsd_engine import WSDEngine
 from .sentiment_scorer import SentimentScorer
+from .result_cache import ResultCache
+from .long_document import LongDocumentAnalyzer
+from .projection import ResponseView, FULL_VIEW
+from .tokenizer import get_tokenizer
 from modules.lexicon_manager import LexiconManager
-from nltk.tokenize import word_tokenize
+from modules.aspect_index import AspectIndex
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+import copy
 import json
+import os
+import time
+
+
+# Analyzer owned by each process-pool worker (see analyze_many)
+_worker_analyzer = None
+
+
+def _init_worker(tokenizer='nltk', parent=None):
+    """
+    Set up the per-process analyzer when a pool worker starts. Forked
+    workers get the parent analyzer (tables shared copy-on-write);
+    spawned ones build their own.
+    """
+    global _worker_analyzer
+    if parent is not None:
+        _worker_analyzer = parent._worker_copy()
+    else:
+        _worker_analyzer = UniversalWSDAnalyzer(tokenizer=tokenizer)
+
+
+def _analyze_chunk(texts, mode, options):
+    """Analyze a chunk of texts inside a pool worker"""
+    return [_worker_analyzer.analyze_one(text, mode, **options) for text in texts]
+
+
+class Document:
+    """Intermediate pipeline output shared with the mode-specific extras"""
+    
+    __slots__ = ('tokens', 'senses', 'emojis', 'contributions')
+    
+    def __init__(self, tokens, senses, emojis, contributions):
+        self.tokens = tokens
+        self.senses = senses
+        self.emojis = emojis
+        self.contributions = contributions
 
 
 class UniversalWSDAnalyzer:
     """Main analyzer combining WSD and Sentiment Analysis"""
     
-    def __init__(self):
+    # Batches smaller than this are analyzed in-process
+    PARALLEL_MIN_TEXTS = 32
+    
+    # Tokens on each side of an aspect mention used for its local sentiment
+    ASPECT_WINDOW = 4
+    CLAUSE_BREAKS = frozenset(['.', '!', '?', ';', 'but', 'however', 'although', 'while'])
+    
+    def __init__(self, cache_size=1024, cache_bytes=32 * 1024 * 1024, tokenizer='nltk'):
+        """tokenizer: 'nltk', 'fast' or an object with ``tokenize(text)``"""
+        self.tokenizer = get_tokenizer(tokenizer)
         self.lexicon = LexiconManager()
         self.wsd = WSDEngine()
         self.scorer = SentimentScorer(self.lexicon)
+        self.aspect_index = AspectIndex.load()
         self.version = "2.0"
+        # Repeated texts (retweets, templates, probes) skip re-analysis
+        self.cache = ResultCache(cache_size, cache_bytes) if cache_size > 0 else None
+        self._batch_scorer = None
+        # Optional modules.metrics.Metrics for per-stage timers
+        self.metrics = None
+        self._pool = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
     
-    def analyze(self, text, mode='general'):
-        """Main analysis method"""
+    def analyze(self, text, mode='general', ambiguous_only=False, category=None,
+                detail='full', fields=None):
+        """
+        Main analysis method
+
+        ambiguous_only: only report disambiguated words in ``wsd_analysis``
+        category:       product category for aspect extraction (product mode)
+        detail:         'minimal', 'standard' or 'full' (see ResponseView)
+        fields:         explicit list of result fields; overrides ``detail``
+
+        Parts of the result nobody asked for are not computed.
+        """
         if not text or len(text.strip()) == 0:
             return {'error': 'Empty text', 'success': False}
         
+        try:
+            view = ResponseView(detail, fields, ambiguous_only)
+        except ValueError as e:
+            return {'error': str(e), 'success': False}
+        
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.bind(mode=mode)
+        
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(
+                mode, text, self.lexicon.version,
+                (('view', view.key()), ('category', category))
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
         try:
             if mode == 'general':
-                return self._analyze_general(text)
+                result = self._analyze_general(text, view)
             elif mode == 'product':
-                return self._analyze_product(text)
+                result = self._analyze_product(text, view, category)
             elif mode == 'social':
-                return self._analyze_social(text)
+                result = self._analyze_social(text, view)
             else:
                 return {'error': f'Unknown mode: {mode}', 'success': False}
+            result = view.apply(result)
+        except Exception as e:
+            result = {'error': str(e), 'success': False}
+        
+        if result.get('success', False):
+            if key is not None:
+                self.cache.put(key, result)
+        elif metrics is not None:
+            metrics.observe_error('analysis')
+        return result
+    
+    def analyze_one(self, text, mode='general', **options):
+        """Analyze one text, turning any failure into an error result"""
+        try:
+            return self.analyze(text, mode, **options)
         except Exception as e:
             return {'error': str(e), 'success': False}
     
-    def _analyze_general(self, text):
+    def analyze_many(self, texts, mode='general', workers=None, chunk_size=None, **options):
+        """
+        Analyze many texts, in parallel across a process pool when worthwhile.
+        
+        Results are returned in input order. A failing text yields an error
+        result in its slot instead of failing the whole batch.
+        
+        workers:    pool size (default: CPU count); 1 analyzes in-process
+        chunk_size: texts sent to a worker per task (default: auto)
+        """
+        texts = list(texts)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        if workers <= 1 or len(texts) < self.PARALLEL_MIN_TEXTS:
+            return [self.analyze_one(text, mode, **options) for text in texts]
+        
+        if not chunk_size:
+            # A few chunks per worker keeps workers busy without tiny tasks
+            chunk_size = max(1, min(256, -(-len(texts) // (workers * 4))))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        
+        pool = self._get_pool(workers)
+        futures = [pool.submit(_analyze_chunk, chunk, mode, options) for chunk in chunks]
+        
+        results = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                # Worker crashed or result could not be returned
+                results.extend({'error': str(e), 'success': False} for _ in chunk)
+                self._discard_pool(pool)
+        return results
+    
+    def analyze_long_document(self, text, top_n=20, max_senses=50, chunk_chars=4000):
+        """
+        General analysis for long texts with roughly constant peak memory.
+        
+        The text is tokenized and scored chunk by chunk. The result keeps the
+        usual fields, but ``word_breakdown`` holds the ``top_n`` most frequent
+        sentiment words, ``wsd_analysis`` a sample of ``max_senses``
+        disambiguated words, and ``text`` a preview.
+        """
+        if not isinstance(text, str) or not text.strip():
+            return {'error': 'Empty text', 'success': False}
+        if self.metrics is not None:
+            self.metrics.bind(mode='long_document')
+        try:
+            return LongDocumentAnalyzer(
+                self, chunk_chars=chunk_chars, top_n=top_n, max_senses=max_senses
+            ).analyze(text)
+        except Exception as e:
+            return {'error': str(e), 'success': False}
+    
+    def score_many(self, texts):
+        """
+        Score many texts with the vectorized batch engine.
+        
+        Much faster than analyze_many for large batches of short texts, but
+        only returns score, sentiment and intensity for each text.
+        """
+        if self._batch_scorer is None:
+            from .batch_scorer import VectorizedScorer
+            self._batch_scorer = VectorizedScorer(self.scorer, self.wsd)
+        
+        texts = list(texts)
+        valid = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+        scanner = self.lexicon.get_emoji_scanner()
+        scores = self._batch_scorer.score_documents(
+            [self.tokenizer.tokenize(texts[i]) for i in valid],
+            [scanner.scan(texts[i]) for i in valid]
+        )
+        
+        results = [{'error': 'Empty text', 'success': False} for _ in texts]
+        for i, score in zip(valid, scores.tolist()):
+            results[i] = {
+                'success': True,
+                'score': round(score, 2),
+                'sentiment': self._get_label(score),
+                'intensity': self._get_intensity(score)
+            }
+        return results
+    
+    def warm_up(self, text):
+        """
+        Run every analysis path once, bypassing the result cache, so the
+        tokenizer models, emoji scanner and aspect indexes are loaded
+        """
+        for category in self.aspect_index.categories():
+            self._analyze_product(text, category=category)
+        self._analyze_social(text)
+    
+    def freeze(self):
+        """
+        Build every lazy table and make the lexicon, sense and scoring
+        tables read-only.
+
+        Call once in a parent process before forking workers (see
+        Services.preload): the workers then share these tables instead of
+        building their own copies. Tables can no longer be edited.
+        """
+        self.lexicon.freeze()
+        self.wsd.freeze()
+        self.scorer.freeze()
+        self.aspect_index.compile_all()
+    
+    def _worker_copy(self):
+        """Copy for a forked pool worker: shared tables, fresh cache and locks"""
+        worker = copy.copy(self)
+        if self.cache is not None:
+            worker.cache = ResultCache(self.cache.max_entries, self.cache.max_bytes)
+        worker.metrics = None
+        worker._pool = None
+        worker._pool_workers = 0
+        worker._pool_lock = threading.Lock()
+        return worker
+    
+    def close(self):
+        """Shut down the worker pool used by analyze_many"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def _get_pool(self, workers):
+        """Get (or resize) the shared process pool"""
+        with self._pool_lock:
+            if self._pool is not None and self._pool_workers == workers:
+                return self._pool
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            parent = self if context.get_start_method() == 'fork' else None
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_worker,
+                initargs=(self.tokenizer, parent)
+            )
+            self._pool_workers = workers
+            return self._pool
+    
+    def _discard_pool(self, pool):
+        """Drop a broken pool so the next batch starts a fresh one"""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+    
+    def _analyze_general(self, text, view=FULL_VIEW):
         """General sentiment analysis"""
+        return self._analyze_document(text, view)[0]
+    
+    def _analyze_document(self, text, view=FULL_VIEW):
+        """General analysis; also returns the processed document for mode extras"""
         try:
             # DO NOT lowercase here; WSD and scorer already handle case
-            tokens = word_tokenize(text)
+            # Normalize each token once; every stage below reads the result
+            clock = time.perf_counter
+            t0 = clock()
+            raw = self.tokenizer.tokenize(text)
+            t1 = clock()
+            tokens = self.scorer.prepare_tokens(raw)
+            t2 = clock()
             senses = self.wsd.disambiguate(tokens)
-            score = self.scorer.score_tokens(tokens, senses)
+            t3 = clock()
+            emojis = self.lexicon.get_emoji_scanner().scan(text)
+            t4 = clock()
+            contributions = self.scorer.token_contributions(tokens, senses)
+            score = self.scorer.score_contributions(contributions, emojis)
             confidence = self._calculate_confidence(score, senses)
+            t5 = clock()
             
-            return {
+            result = {
                 'success': True,
                 'text': text,
                 'score': round(score, 2),
                 'sentiment': self._get_label(score),
                 'confidence': round(confidence, 2),
-                'intensity': self._get_intensity(score),
-                'wsd_analysis': senses,
-                'word_breakdown': self._breakdown_words(tokens)
+                'intensity': self._get_intensity(score)
             }
+            if view.wants('wsd_analysis'):
+                result['wsd_analysis'] = senses.to_dict(
+                    ambiguous_only=view.ambiguous_only, context=view.wsd_context
+                )
+            t6 = clock()
+            if view.wants('word_breakdown'):
+                result['word_breakdown'] = self._breakdown_words(tokens)
+            
+            if self.metrics is not None:
+                self.metrics.observe_tokens(len(tokens))
+                self.metrics.observe_stages((
+                    ('tokenize', t1 - t0), ('prepare', t2 - t1),
+                    ('disambiguate', t3 - t2), ('emoji_scan', t4 - t3),
+                    ('score', t5 - t4), ('wsd_output', t6 - t5),
+                    ('word_breakdown', clock() - t6)
+                ))
+            return result, Document(tokens, senses, emojis, contributions)
         except Exception as e:
-            return {'error': str(e), 'success': False}
+            return {'error': str(e), 'success': False}, None
     
-    def _analyze_product(self, text):
+    def _analyze_product(self, text, view=FULL_VIEW, category=None):
         """Product review analysis"""
-        result = self._analyze_general(text)
+        result, doc = self._analyze_document(text, view)
         if not result.get('success', False):
             return result
         
-        aspects = self._extract_aspects(text)
+        start = time.perf_counter()
         recommendation = self._get_recommendation(result['score'])
         
-        return {
+        result = {
             **result,
             'mode': 'product',
-            'aspects': aspects,
             'recommend': recommendation
         }
+        if view.wants('aspects'):
+            result['aspects'] = self._extract_aspects(doc, category)
+        if self.metrics is not None:
+            self.metrics.observe_stage('product_extras', time.perf_counter() - start)
+        return result
     
-    def _analyze_social(self, text):
+    def _analyze_social(self, text, view=FULL_VIEW):
         """Social media analysis"""
-        result = self._analyze_general(text)
+        result, doc = self._analyze_document(text, view)
         if not result.get('success', False):
             return result
         
+        start = time.perf_counter()
         hashtags = self._extract_hashtags(text)
         engagement = self._calculate_engagement(result, hashtags, text)
-        emojis = self._analyze_emojis(text)
+        emojis = self._analyze_emojis(doc.emojis)
         
-        return {
+        result = {
             **result,
             'mode': 'social',
             'hashtags': hashtags,
             'engagement_score': engagement,
-            'emoji_analysis': emojis
+            'emoji_analysis': emojis,
+            'emoji_counts': self._count_emojis(doc.emojis)
         }
+        if self.metrics is not None:
+            self.metrics.observe_stage('social_extras', time.perf_counter() - start)
+        return result
     
     def _get_label(self, score):
         """Get sentiment label from score"""
@@ -99,6 +393,19 @@ class UniversalWSDAnalyzer:
         else:
             return 'NEUTRAL'
     
+    def _get_aspect_label(self, score):
+        """
+        Label of an aspect's local score. A mention window usually holds
+        one or two sentiment words, so any sign counts; the ±1.0 document
+        thresholds would call a lone "good" (1.0) neutral.
+        """
+        if score > 0:
+            return 'POSITIVE'
+        elif score < 0:
+            return 'NEGATIVE'
+        else:
+            return 'NEUTRAL'
+    
     def _get_intensity(self, score):
         """Get intensity level"""
         abs_score = abs(score)
@@ -113,31 +420,68 @@ class UniversalWSDAnalyzer:
     
     def _calculate_confidence(self, score, senses):
         """Calculate confidence score"""
+        return self._combine_confidence(score, senses.mean_confidence())
+    
+    def _combine_confidence(self, score, sense_confidence):
+        """Combine score strength with the mean WSD confidence"""
         base_confidence = min(100, max(0, abs(score) * 15))
-        sense_confidence = sum(
-            s.get('confidence', 0.5) for s in senses.values()
-        ) / max(len(senses), 1)
         return (base_confidence + (sense_confidence * 100)) / 2
     
     def _breakdown_words(self, tokens):
         """Get word-by-word breakdown"""
         breakdown = {}
-        for token in set(tokens):
-            score = self.lexicon.get_sentiment_score(token)
-            if score != 0:
-                breakdown[token] = score
+        for token in self.scorer.prepare_tokens(tokens):
+            if token.score != 0:
+                breakdown[token.raw] = token.score
         return breakdown
     
-    def _extract_aspects(self, text):
-        """Extract product aspects"""
+    def _extract_aspects(self, doc, category=None):
+        """Extract product aspects with the sentiment of the words around them"""
+        words = [token.norm for token in doc.tokens]
+        mentions = self.aspect_index.match(words, category)
+        if not mentions:
+            return {}
+        
+        # Prefix sums make each window's sentiment O(1); windows stop at
+        # clause boundaries so "quality is great but shipping is slow"
+        # does not mix the two opinions
+        sums = [0.0]
+        counts = [0]
+        clause_start = []
+        start_of_clause = 0
+        for i, (token, value) in enumerate(zip(doc.tokens, doc.contributions)):
+            sums.append(sums[-1] + value)
+            counts.append(counts[-1] + (value != 0))
+            if token.raw in self.CLAUSE_BREAKS or token.norm in self.CLAUSE_BREAKS:
+                start_of_clause = i + 1
+            clause_start.append(start_of_clause)
+        
+        n = len(words)
+        clause_end = [n] * n
+        end_of_clause = n
+        for i in range(n - 1, -1, -1):
+            token = doc.tokens[i]
+            if token.raw in self.CLAUSE_BREAKS or token.norm in self.CLAUSE_BREAKS:
+                end_of_clause = i
+            clause_end[i] = end_of_clause
+        
+        totals = {}
+        for start, end, aspect in mentions:
+            lo = max(clause_start[start], start - self.ASPECT_WINDOW)
+            hi = min(clause_end[end - 1], end + self.ASPECT_WINDOW)
+            entry = totals.setdefault(aspect, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += sums[hi] - sums[lo]
+            entry[2] += counts[hi] - counts[lo]
+        
         aspects = {}
-        product_keywords = [
-            'quality', 'price', 'shipping', 'service', 
-            'packaging', 'durability', 'design', 'value'
-        ]
-        for keyword in product_keywords:
-            if keyword in text.lower():
-                aspects[keyword] = 'detected'
+        for aspect, (mentions_count, total, count) in totals.items():
+            score = total / count if count else 0.0
+            aspects[aspect] = {
+                'mentions': mentions_count,
+                'score': round(score, 2),
+                'sentiment': self._get_aspect_label(score)
+            }
         return aspects
     
     def _extract_hashtags(self, text):
@@ -158,14 +502,17 @@ class UniversalWSDAnalyzer:
         engagement += abs(result['score']) * 5
         return min(10, round(engagement, 1))
     
-    def _analyze_emojis(self, text):
-        """Analyze emojis in text"""
+    def _analyze_emojis(self, emojis):
+        """Analyze emojis found by the emoji scanner"""
         emoji_sentiments = self.lexicon.get_emoji_sentiments()
-        emojis_found = {}
-        for emoji, sentiment in emoji_sentiments.items():
-            if emoji in text:
-                emojis_found[emoji] = sentiment
-        return emojis_found
+        return {emoji: emoji_sentiments[emoji] for _, _, emoji in emojis}
+    
+    def _count_emojis(self, emojis):
+        """Count occurrences of each emoji"""
+        counts = {}
+        for _, _, emoji in emojis:
+            counts[emoji] = counts.get(emoji, 0) + 1
+        return counts
     
     def _get_recommendation(self, score):
         """Get recommendation based on score"""
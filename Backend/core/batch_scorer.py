@@ -0,0 +1,135 @@
+"""
+Vectorized batch scoring engine (NumPy)
+"""
+from typing import List
+
+import numpy as np
+
+from .tokens import normalize
+
+
+class VectorizedScorer:
+    """
+    Score many documents at once with array operations.
+
+    Documents are mapped to token-ID arrays over a vocabulary whose
+    lexicon score, negator flag and intensifier multiplier are kept as
+    vectors. Negation scope and intensifiers become shifted masks over the
+    concatenated batch, and per-document means are segmented sums, so the
+    only per-token Python work left is tokenization and the vocabulary
+    lookup. WSD runs only for documents containing words that have a
+    sense override. Matches ``SentimentScorer.score_tokens``.
+    """
+
+    # Vocabulary is rebuilt once it grows past this many words
+    MAX_VOCABULARY = 1_000_000
+
+    # Negation looks back this many tokens (same as SentimentScorer)
+    NEGATION_SCOPE = 3
+
+    def __init__(self, scorer, wsd):
+        self.scorer = scorer
+        self.wsd = wsd
+        self._reset()
+
+    def _reset(self):
+        self._version = self.scorer.lexicon.version
+        self._vocab = {}
+        self._scores = []
+        self._negators = []
+        self._intensities = []
+        self._overridable = []
+        self._arrays = None
+
+    def _word_id(self, word):
+        word_id = self._vocab.get(word)
+        if word_id is None:
+            word_id = self._vocab[word] = len(self._scores)
+            self._scores.append(self.scorer.lexicon.lookup(word))
+            self._negators.append(word in self.scorer.negations)
+            self._intensities.append(self.scorer.intensifiers.get(word, 1.0))
+            self._overridable.append(word in self.scorer.wsd_overrides)
+            self._arrays = None
+        return word_id
+
+    def _vectors(self):
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self._scores, dtype=np.float64),
+                np.array(self._negators, dtype=bool),
+                np.array(self._intensities, dtype=np.float64),
+                np.array(self._overridable, dtype=bool),
+            )
+        return self._arrays
+
+    def score_documents(self, documents: List[List[str]], emojis=None) -> np.ndarray:
+        """
+        Score tokenized documents.
+
+        documents: list of raw token lists
+        emojis:    optional per-document EmojiScanner matches
+        Returns one mean score per document.
+        """
+        if (self.scorer.lexicon.version != self._version
+                or len(self._vocab) > self.MAX_VOCABULARY):
+            self._reset()
+
+        n_docs = len(documents)
+        words = [[normalize(token) for token in doc] for doc in documents]
+        ids = np.fromiter(
+            (self._word_id(word) for doc in words for word in doc), dtype=np.int64
+        )
+        lengths = np.fromiter((len(doc) for doc in documents), dtype=np.int64, count=n_docs)
+        starts = np.zeros(n_docs, dtype=np.int64)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        doc_index = np.repeat(np.arange(n_docs), lengths)
+        # Position of each token within its own document
+        local = np.arange(len(ids), dtype=np.int64) - starts[doc_index]
+
+        score_vec, negator_vec, intensity_vec, overridable_vec = self._vectors()
+        base = score_vec[ids]
+        wsd_applied = np.zeros(len(ids), dtype=bool)
+
+        # WSD overrides, only for documents that contain an overridable word
+        overridable = overridable_vec[ids]
+        if overridable.any():
+            overrides = self.scorer.wsd_overrides
+            for d in np.unique(doc_index[overridable]):
+                # Normalized words are valid input and skip re-normalizing
+                senses = self.wsd.disambiguate(words[d])
+                offset = starts[d]
+                for position, result in senses.items():
+                    table = overrides.get(words[d][position])
+                    if table is not None and result.sense in table:
+                        base[offset + position] = table[result.sense]
+                        wsd_applied[offset + position] = True
+
+        # Negation: any negator within the previous NEGATION_SCOPE tokens
+        negator = negator_vec[ids]
+        negated = np.zeros(len(ids), dtype=bool)
+        for k in range(1, self.NEGATION_SCOPE + 1):
+            negated[k:] |= negator[:-k] & (local[k:] >= k)
+        sign = np.where(negated & ~wsd_applied, -1.0, 1.0)
+
+        # Intensifier: multiplier of the directly preceding token
+        multiplier = np.ones(len(ids), dtype=np.float64)
+        if len(ids) > 1:
+            multiplier[1:] = np.where(local[1:] >= 1, intensity_vec[ids[:-1]], 1.0)
+
+        counted = base != 0
+        contributions = np.where(counted, base * sign * multiplier, 0.0)
+
+        # Segmented reductions: per-document sums and counts
+        totals = np.bincount(doc_index, weights=contributions, minlength=n_docs)
+        counts = np.bincount(doc_index, weights=counted, minlength=n_docs)
+
+        if emojis:
+            emoji_sentiments = self.scorer.lexicon.get_emoji_sentiments()
+            for d, matches in enumerate(emojis):
+                for _, _, emoji in matches:
+                    value = emoji_sentiments.get(emoji, 0.0)
+                    if value != 0:
+                        totals[d] += value
+                        counts[d] += 1
+
+        return np.divide(totals, counts, out=np.zeros(n_docs), where=counts > 0)
@@ -0,0 +1,201 @@
+"""
+Incremental analysis of a document that is edited in place (live typing)
+"""
+from bisect import bisect_right
+from itertools import accumulate
+
+from .long_document import iter_text_chunks
+
+# Text is kept in blocks of at most about this many characters, ending at
+# a sentence break or whitespace; an edit re-tokenizes only its blocks
+BLOCK_CHARS = 200
+
+# Full recount of the running totals after this many edits, so floating
+# point drift never accumulates
+RESYNC_EDITS = 256
+
+
+class IncrementalDocument:
+    """
+    General-mode analysis kept up to date under edits.
+
+    The text is stored as blocks that end at sentence breaks or whitespace,
+    each with its prepared tokens and emoji sentiment. ``edit`` re-tokenizes
+    only the blocks the edit touches (plus one neighbour on each side, in
+    case a break appeared or vanished), then recomputes word senses and
+    token contributions only within the WSD window / negation scope around
+    the changed tokens, and updates the running score totals. Per-edit work
+    is proportional to the edit, not the document; the only whole-document
+    steps are list splices and offset sums, which run in C.
+
+    Results match ``analyze(text)`` for the same tokens; the text is
+    tokenized block by block, like long-document mode.
+    """
+
+    def __init__(self, analyzer, text=''):
+        self.analyzer = analyzer
+        # Left and right context that can influence one token's contribution
+        self.margin = max(analyzer.wsd.window_size, 3)
+        self.version = 0
+        self._blocks = []        # block text
+        self._block_tokens = []  # tokens per block
+        self._block_emojis = []  # (emoji score sum, emoji count) per block
+        self._tokens = []        # prepared tokens of the whole document
+        self._contributions = []
+        self._confidences = []   # sense confidence per token (1.0 if unambiguous)
+        # Running totals, updated by each edit
+        self._total = 0.0
+        self._count = 0
+        self._confidence_total = 0.0
+        self._emoji_total = 0.0
+        self._emoji_count = 0
+        self._edits = 0
+        self.edit(0, 0, text)
+        self.version = 0
+
+    @property
+    def text(self):
+        return ''.join(self._blocks)
+
+    def __len__(self):
+        return sum(map(len, self._blocks))
+
+    def edit(self, offset, delete=0, insert=''):
+        """
+        Replace ``delete`` characters at ``offset`` with ``insert``.
+
+        Offsets count Unicode code points. Raises ValueError when the range
+        falls outside the text.
+        """
+        length = len(self)
+        if not (0 <= offset <= length) or delete < 0 or offset + delete > length:
+            raise ValueError('Edit range outside the text')
+
+        # Blocks touched by the edit, widened by one neighbour on each side
+        starts = [0, *accumulate(map(len, self._blocks))]
+        count = len(self._blocks)
+        first = max(bisect_right(starts, offset) - 2, 0)
+        last = min(bisect_right(starts, offset + delete) + 1, count)
+        region_start = starts[first]
+        old = ''.join(self._blocks[first:last])
+        relative = offset - region_start
+        new = old[:relative] + insert + old[relative + delete:]
+
+        blocks, block_tokens, block_emojis = self._prepare_blocks(new)
+        token_starts = [0, *accumulate(map(len, self._block_tokens))]
+        a, b = token_starts[first], token_starts[last]
+        tokens = [token for block in block_tokens for token in block]
+
+        for value, hits in self._block_emojis[first:last]:
+            self._emoji_total -= value
+            self._emoji_count -= hits
+        for value, hits in block_emojis:
+            self._emoji_total += value
+            self._emoji_count += hits
+
+        self._blocks[first:last] = blocks
+        self._block_tokens[first:last] = block_tokens
+        self._block_emojis[first:last] = block_emojis
+        self._tokens[a:b] = tokens
+        self._rescore(a, b, a + len(tokens))
+
+        self.version += 1
+        self._edits += 1
+        if self._edits % RESYNC_EDITS == 0:
+            self._resync()
+        return self.result()
+
+    def _prepare_blocks(self, text):
+        analyzer = self.analyzer
+        tokenize = analyzer.tokenizer.tokenize
+        prepare = analyzer.scorer.prepare_tokens
+        scan = analyzer.lexicon.get_emoji_scanner().scan
+        emoji_sentiments = analyzer.lexicon.get_emoji_sentiments()
+
+        blocks, block_tokens, block_emojis = [], [], []
+        for block in iter_text_chunks(text, BLOCK_CHARS):
+            blocks.append(block)
+            block_tokens.append(prepare(tokenize(block)) if block.strip() else [])
+            value, hits = 0.0, 0
+            for _, _, emoji in scan(block):
+                score = emoji_sentiments.get(emoji, 0.0)
+                if score != 0:
+                    value += score
+                    hits += 1
+            block_emojis.append((value, hits))
+        return blocks, block_tokens, block_emojis
+
+    def _rescore(self, a, old_end, new_end):
+        """
+        Recompute senses and contributions for tokens whose WSD window or
+        negation scope overlaps the replaced range (old [a, old_end),
+        now [a, new_end)).
+        """
+        margin = self.margin
+        tokens = self._tokens
+        n = len(tokens)
+        lo = max(0, a - margin)
+        old_hi = min(len(self._contributions), old_end + margin)
+        hi = min(n, new_end + margin)
+
+        for value in self._contributions[lo:old_hi]:
+            if value != 0:
+                self._total -= value
+                self._count -= 1
+        self._confidence_total -= sum(self._confidences[lo:old_hi])
+
+        # Context slice wide enough that every window in [lo, hi) is whole
+        start = max(0, lo - margin)
+        context = tokens[start:min(n, hi + margin)]
+        senses = self.analyzer.wsd.disambiguate(context)
+        contributions = self.analyzer.scorer.token_contributions(
+            context, senses, lo - start, hi - start
+        )
+        confidences = [1.0] * (hi - lo)
+        for position in senses:
+            if lo <= start + position < hi:
+                confidences[start + position - lo] = senses[position].confidence
+
+        for value in contributions:
+            if value != 0:
+                self._total += value
+                self._count += 1
+        self._confidence_total += sum(confidences)
+
+        self._contributions[lo:old_hi] = contributions
+        self._confidences[lo:old_hi] = confidences
+
+    def _resync(self):
+        """Recount the running totals from the stored per-token values"""
+        self._total = 0.0
+        self._count = 0
+        for value in self._contributions:
+            if value != 0:
+                self._total += value
+                self._count += 1
+        self._confidence_total = sum(self._confidences)
+        self._emoji_total = 0.0
+        self._emoji_count = 0
+        for value, hits in self._block_emojis:
+            self._emoji_total += value
+            self._emoji_count += hits
+
+    def result(self):
+        """Core analysis fields for the current text"""
+        analyzer = self.analyzer
+        units = self._count + self._emoji_count
+        score = (self._total + self._emoji_total) / units if units else 0.0
+        n = len(self._tokens)
+        confidence = analyzer._combine_confidence(score, self._confidence_total / max(n, 1))
+        return {
+            'success': True,
+            'score': round(score, 2),
+            'sentiment': analyzer._get_label(score),
+            'confidence': round(confidence, 2),
+            'intensity': analyzer._get_intensity(score),
+            'tokens': n
+        }
+
+    def word_breakdown(self):
+        """Sentiment words of the current text (O(document))"""
+        return self.analyzer._breakdown_words(self._tokens)
@@ -0,0 +1,163 @@
+"""
+Bounded-memory analysis for long documents (articles, web pages)
+"""
+import random
+import re
+
+# Whitespace that follows a sentence terminator, or a blank line
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+
+def iter_text_chunks(text, chunk_chars=4000):
+    """
+    Yield consecutive chunks of about ``chunk_chars`` characters.
+
+    Chunks end at a sentence break when one exists in the chunk, else at
+    whitespace, so tokenizing chunk by chunk gives the same tokens as
+    tokenizing the whole text.
+    """
+    n = len(text)
+    start = 0
+    while start < n:
+        end = min(n, start + chunk_chars)
+        if end < n:
+            window = text[start:end]
+            cut = None
+            for match in _SENTENCE_BREAK.finditer(window):
+                cut = match.end()
+            if cut is None:
+                space = max(window.rfind(' '), window.rfind('\n'))
+                cut = space + 1 if space > 0 else len(window)
+            end = start + cut
+        yield text[start:end]
+        start = end
+
+
+class LongDocumentAnalyzer:
+    """
+    Chunked general-mode analysis with roughly constant peak memory.
+
+    Text is tokenized and scored chunk by chunk. Each chunk is processed
+    together with the last tokens of the previous chunk and the first
+    tokens of the next one, so WSD windows and negation/intensifier scope
+    see the same context as in a whole-document pass. Only aggregates, the
+    top sentiment words and a fixed-size sample of senses are kept.
+    """
+
+    def __init__(self, analyzer, chunk_chars=4000, top_n=20, max_senses=50):
+        self.analyzer = analyzer
+        self.chunk_chars = chunk_chars
+        self.top_n = top_n
+        self.max_senses = max_senses
+
+    def _token_chunks(self, text):
+        prepare = self.analyzer.scorer.prepare_tokens
+        tokenize = self.analyzer.tokenizer.tokenize
+        scanner = self.analyzer.lexicon.get_emoji_scanner()
+        for chunk in iter_text_chunks(text, self.chunk_chars):
+            tokens = prepare(tokenize(chunk))
+            if tokens:
+                yield tokens, scanner.scan(chunk)
+
+    def analyze(self, text):
+        analyzer = self.analyzer
+        scorer = analyzer.scorer
+        wsd = analyzer.wsd
+        window = wsd.window_size
+        # Left context must cover both the WSD window and negation scope
+        carry = max(window, 3)
+
+        total = 0.0
+        count = 0
+        emoji_total = 0.0
+        emoji_count = 0
+        confidence_total = 0.0
+        n_tokens = 0
+        n_chunks = 0
+        n_ambiguous = 0
+        words = {}
+        sample = []
+        rng = random.Random(0)
+
+        chunks = self._token_chunks(text)
+        current = next(chunks, None)
+        previous_tail = []
+        while current is not None:
+            tokens, emojis = current
+            following = next(chunks, None)
+            head = following[0][:window] if following else []
+
+            context = previous_tail + tokens + head
+            start = len(previous_tail)
+            end = start + len(tokens)
+            senses = wsd.disambiguate(context)
+            contributions = scorer.token_contributions(context, senses, start, end)
+
+            for offset, value in enumerate(contributions):
+                position = start + offset
+                token = context[position]
+                if value != 0:
+                    total += value
+                    count += 1
+                if token.score != 0:
+                    entry = words.setdefault(token.norm, [token.score, 0])
+                    entry[1] += 1
+
+                if position in senses:
+                    result = senses[position]
+                    confidence_total += result.confidence
+                    n_ambiguous += 1
+                    item = (n_tokens + offset, {
+                        'word': result.word,
+                        'sense': result.sense,
+                        'confidence': result.confidence
+                    })
+                    # Reservoir sample of disambiguated words
+                    if len(sample) < self.max_senses:
+                        sample.append(item)
+                    else:
+                        k = rng.randrange(n_ambiguous)
+                        if k < self.max_senses:
+                            sample[k] = item
+                else:
+                    confidence_total += 1.0
+
+            emoji_sentiments = analyzer.lexicon.get_emoji_sentiments()
+            for _, _, emoji in emojis:
+                value = emoji_sentiments.get(emoji, 0.0)
+                if value != 0:
+                    emoji_total += value
+                    emoji_count += 1
+
+            n_tokens += len(tokens)
+            n_chunks += 1
+            previous_tail = (previous_tail + tokens)[-carry:]
+            current = following
+
+        if n_tokens == 0:
+            return {'error': 'Empty text', 'success': False}
+
+        units = count + emoji_count
+        score = (total + emoji_total) / units if units else 0.0
+        confidence = analyzer._combine_confidence(score, confidence_total / n_tokens)
+
+        top_words = sorted(words.items(), key=lambda kv: (-kv[1][1], -abs(kv[1][0]), kv[0]))
+        sample.sort(key=lambda item: item[0])
+
+        return {
+            'success': True,
+            'text': text[:300] + ('...' if len(text) > 300 else ''),
+            'score': round(score, 2),
+            'sentiment': analyzer._get_label(score),
+            'confidence': round(confidence, 2),
+            'intensity': analyzer._get_intensity(score),
+            'wsd_analysis': dict(sample),
+            'word_breakdown': {word: entry[0] for word, entry in top_words[:self.top_n]},
+            'long_document': {
+                'chunks': n_chunks,
+                'tokens': n_tokens,
+                'sentiment_words': count,
+                'ambiguous_words': n_ambiguous,
+                'senses_sampled': len(sample)
+            }
+        }
@@ -0,0 +1,73 @@
+"""
+Response projection - which result fields a caller asked for
+"""
+
+DETAIL_LEVELS = ('minimal', 'standard', 'full')
+
+# Always returned, whatever the detail level
+CORE_FIELDS = frozenset([
+    'success', 'score', 'sentiment', 'confidence', 'intensity', 'mode'
+])
+
+# Mode-specific extras, returned from 'standard' up
+MODE_FIELDS = frozenset([
+    'aspects', 'recommend',
+    'hashtags', 'engagement_score', 'emoji_analysis', 'emoji_counts'
+])
+
+STANDARD_FIELDS = CORE_FIELDS | MODE_FIELDS | {'text', 'word_breakdown', 'wsd_analysis'}
+
+
+class ResponseView:
+    """
+    Fields to compute and return for one analysis.
+
+    detail:         'minimal' (core scores only), 'standard' (adds text,
+                    word breakdown, mode extras and the disambiguated words
+                    without context) or 'full' (everything, the default)
+    fields:         explicit list of top-level fields; overrides ``detail``
+    ambiguous_only: only report disambiguated words in ``wsd_analysis``
+    """
+
+    __slots__ = ('fields', 'ambiguous_only', 'wsd_context')
+
+    def __init__(self, detail='full', fields=None, ambiguous_only=False):
+        if detail not in DETAIL_LEVELS:
+            raise ValueError(f'Unknown detail level: {detail}')
+
+        if fields is not None:
+            if isinstance(fields, str):
+                fields = fields.split(',')
+            self.fields = frozenset(f.strip() for f in fields) | {'success'}
+            self.ambiguous_only = bool(ambiguous_only)
+            self.wsd_context = True
+        elif detail == 'minimal':
+            self.fields = CORE_FIELDS
+            self.ambiguous_only = True
+            self.wsd_context = False
+        elif detail == 'standard':
+            self.fields = STANDARD_FIELDS
+            self.ambiguous_only = True
+            self.wsd_context = False
+        else:
+            self.fields = None
+            self.ambiguous_only = bool(ambiguous_only)
+            self.wsd_context = True
+
+    def wants(self, name):
+        """True if the field should be computed"""
+        return self.fields is None or name in self.fields
+
+    def key(self):
+        """Hashable form for cache keys"""
+        fields = tuple(sorted(self.fields)) if self.fields is not None else None
+        return (fields, self.ambiguous_only, self.wsd_context)
+
+    def apply(self, result):
+        """Drop fields that were not asked for (error results pass through)"""
+        if self.fields is None or not result.get('success', False):
+            return result
+        return {k: v for k, v in result.items() if k in self.fields}
+
+
+FULL_VIEW = ResponseView()
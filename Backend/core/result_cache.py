@@ -0,0 +1,84 @@
+"""
+Bounded LRU cache for analysis results
+"""
+from collections import OrderedDict
+import hashlib
+import pickle
+import threading
+
+
+class ResultCache:
+    """
+    In-process LRU cache of analysis results.
+
+    Entries are stored pickled: the pickle size is the memory bound and
+    every ``get`` returns an independent copy, so callers may mutate the
+    result (e.g. add ``source_url``) without corrupting the cache.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(mode, text, version, options=()):
+        """Cache key: (mode, text digest, lexicon version, options)"""
+        digest = hashlib.blake2b(
+            text.encode('utf-8', 'surrogatepass'), digest_size=16
+        ).digest()
+        return (mode, digest, version, tuple(sorted(options)))
+
+    def get(self, key):
+        """Return a copy of the cached result, or None on a miss"""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return pickle.loads(blob)
+
+    def put(self, key, result):
+        """Store a result, evicting least recently used entries as needed"""
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = blob
+            self._bytes += len(blob)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
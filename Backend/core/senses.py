@@ -0,0 +1,155 @@
+"""
+Compact word sense results produced by WSDEngine
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from .tokens import normalize
+
+
+class SenseResult:
+    """Sense chosen for one ambiguous token"""
+
+    __slots__ = ('position', 'word', 'sense', 'confidence')
+
+    def __init__(self, position, word, sense, confidence):
+        self.position = position
+        self.word = word
+        self.sense = sense
+        self.confidence = confidence
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __repr__(self):
+        return f"SenseResult({self.position}, {self.word!r}, {self.sense!r}, {self.confidence})"
+
+
+class SenseMap:
+    """
+    Sparse mapping of token position -> SenseResult.
+
+    Only ambiguous positions are stored, in parallel arrays. Unambiguous
+    tokens (confidence 1.0) and context windows are only built by
+    ``to_dict`` when the result is serialized.
+    """
+
+    __slots__ = ('_tokens', '_inventory', 'window_size',
+                 '_positions', '_senses', '_confidences')
+
+    def __init__(self, tokens, inventory: Dict[str, List[str]], window_size: int):
+        self._tokens = tokens
+        self._inventory = inventory
+        self.window_size = window_size
+        self._positions = array('l')
+        self._senses: List[str] = []
+        self._confidences = array('d')
+
+    def add(self, position: int, sense: str, confidence: float) -> None:
+        """Record the sense of an ambiguous token (positions must increase)."""
+        self._positions.append(position)
+        self._senses.append(sense)
+        self._confidences.append(confidence)
+
+    @property
+    def token_count(self) -> int:
+        return len(self._tokens)
+
+    def _slot(self, position) -> Optional[int]:
+        k = bisect_left(self._positions, position)
+        if k < len(self._positions) and self._positions[k] == position:
+            return k
+        return None
+
+    def _result(self, k: int) -> SenseResult:
+        position = self._positions[k]
+        token = self._tokens[position]
+        return SenseResult(
+            position, getattr(token, 'raw', token), self._senses[k], self._confidences[k]
+        )
+
+    def __contains__(self, position) -> bool:
+        return self._slot(position) is not None
+
+    def __getitem__(self, position) -> SenseResult:
+        k = self._slot(position)
+        if k is None:
+            raise KeyError(position)
+        return self._result(k)
+
+    def get(self, position, default=None):
+        k = self._slot(position)
+        return default if k is None else self._result(k)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def keys(self):
+        return list(self._positions)
+
+    def values(self):
+        return [self._result(k) for k in range(len(self._positions))]
+
+    def items(self):
+        return [(self._positions[k], self._result(k)) for k in range(len(self._positions))]
+
+    def mean_confidence(self) -> float:
+        """Average sense confidence over all tokens (unambiguous count as 1.0)."""
+        n = len(self._tokens)
+        # Accumulate in token order so rounding matches a dense per-token sum
+        total = 0.0
+        previous = 0
+        for position, confidence in zip(self._positions, self._confidences):
+            for _ in range(position - previous):
+                total += 1.0
+            total += confidence
+            previous = position + 1
+        for _ in range(n - previous):
+            total += 1.0
+        return total / max(n, 1)
+
+    def to_dict(self, ambiguous_only: bool = False, context: bool = True) -> Dict[int, Dict]:
+        """
+        Serialize to the ``wsd_analysis`` shape: position -> sense dict.
+
+        ambiguous_only: only include words that needed disambiguation
+        context:        include the token context window of each entry
+        """
+        raw = [getattr(t, 'raw', t) for t in self._tokens]
+        n = len(raw)
+        window = self.window_size
+
+        def entry(i, sense, confidence):
+            item = {'word': raw[i], 'sense': sense, 'confidence': confidence}
+            if context:
+                item['context'] = raw[max(0, i - window):min(n, i + window + 1)]
+            return item
+
+        if ambiguous_only:
+            return {
+                self._positions[k]: entry(self._positions[k], self._senses[k], self._confidences[k])
+                for k in range(len(self._positions))
+            }
+
+        result = {}
+        k = 0
+        for i, token in enumerate(self._tokens):
+            if k < len(self._positions) and self._positions[k] == i:
+                result[i] = entry(i, self._senses[k], self._confidences[k])
+                k += 1
+            else:
+                word = getattr(token, 'norm', None)
+                if word is None:
+                    word = normalize(token)
+                result[i] = entry(i, self._inventory.get(word, [word])[0], 1.0)
+        return result
@@ -1,6 +1,9 @@
 """
 Sentiment Scoring Engine with WSD-aware scoring
 """
+from types import MappingProxyType
+
+from .tokens import Token, normalize
 
 
 class SentimentScorer:
@@ -16,7 +19,10 @@ class SentimentScorer:
         }
         self.negations = [
             'not', 'never', 'hardly', 'barely', 'scarcely',
-            'no', "don't", "doesn't", "didn't", "won't"
+            'no', "don't", "doesn't", "didn't", "won't",
+            # Whole contractions as kept by the fast tokenizer
+            'cannot', "can't", "isn't", "aren't", "wasn't", "weren't",
+            "couldn't", "shouldn't", "wouldn't", "haven't", "hasn't", "ain't"
         ]
         
         # WSD Sentiment overrides - based on sense
@@ -39,64 +45,123 @@ class SentimentScorer:
             }
         }
     
-    def score_tokens(self, tokens, senses):
-        """Score sentiment of token sequence with WSD awareness"""
-        total_score = 0
-        word_count = 0
-        
-        for i, token in enumerate(tokens):
-            word_lower = token.lower().strip('.,!?;:\'"')
-            
-            # Check for WSD sense FIRST (highest priority)
-            word_score = 0
+    def freeze(self):
+        """Make the scoring tables read-only (see UniversalWSDAnalyzer.freeze)"""
+        self.intensifiers = MappingProxyType(dict(self.intensifiers))
+        self.negations = frozenset(self.negations)
+        self.wsd_overrides = MappingProxyType({
+            word: MappingProxyType(dict(senses))
+            for word, senses in self.wsd_overrides.items()
+        })
+    
+    def prepare_tokens(self, tokens):
+        """
+        Normalize raw tokens once and attach lexicon, negation and
+        intensifier information for every later stage.
+        """
+        prepared = []
+        for token in tokens:
+            if isinstance(token, Token):
+                prepared.append(token)
+                continue
+            norm = normalize(token)
+            prepared.append(Token(
+                token,
+                norm,
+                score=self.lexicon.lookup(norm),
+                is_negator=norm in self.negations,
+                intensity=self.intensifiers.get(norm, 1.0)
+            ))
+        return prepared
+
+    def score_tokens(self, tokens, senses, emojis=None):
+        """
+        Score sentiment of token sequence with WSD awareness.
+
+        tokens: list of raw tokens or prepared ``Token`` objects
+        senses: dict from WSDEngine.disambiguate(tokens)
+        emojis: optional (start, end, emoji) matches from EmojiScanner.scan;
+                each occurrence counts as one sentiment-bearing unit
+        """
+        contributions = self.token_contributions(self.prepare_tokens(tokens), senses)
+        return self.score_contributions(contributions, emojis)
+
+    def token_contributions(self, tokens, senses, start=0, end=None):
+        """
+        Signed, intensified score of each token in tokens[start:end].
+
+        Tokens without sentiment contribute 0.0. Negation and intensifier
+        context is read from the whole token list, so a sub-range scores
+        exactly as it would inside the full document.
+        """
+        end = len(tokens) if end is None else end
+        contributions = []
+
+        for i in range(start, end):
+            token = tokens[i]
+            word_lower = token.norm
+
+            # Start neutral
+            word_score = 0.0
             wsd_applied = False
-            
-            if i in senses:
-                sense_info = senses[i]
-                sense = sense_info['sense']
-                
-                # Apply WSD override if available
-                if word_lower in self.wsd_overrides:
-                    overrides = self.wsd_overrides[word_lower]
-                    if sense in overrides:
-                        word_score = overrides[sense]
-                        wsd_applied = True
-            
-            # If no WSD override, use lexicon
+
+            # 1) Try WSD override first (highest priority)
+            if word_lower in self.wsd_overrides and i in senses:
+                sense = senses[i].get('sense')
+                overrides = self.wsd_overrides[word_lower]
+                if sense in overrides:
+                    word_score = overrides[sense]
+                    wsd_applied = True
+
+            # 2) If no WSD override, fall back to lexicon
             if not wsd_applied:
-                word_score = self.lexicon.get_sentiment_score(word_lower)
-            
-            # Skip if word has no sentiment
+                word_score = token.score
+
+            # 3) Skip if word has no sentiment
             if word_score == 0:
+                contributions.append(0.0)
                 continue
-            
-            # Check for negation in previous words (within 3 words)
-            # BUT: Don't negate if WSD already handled it
-            negation_flag = False
+
+            # 4) Check for negation in previous words (within 3 words)
+            #    BUT: Do not negate if WSD override already applied
             if not wsd_applied:
-                for j in range(max(0, i-3), i):
-                    if tokens[j].lower() in self.negations:
+                negation_flag = False
+                for j in range(max(0, i - 3), i):
+                    if tokens[j].is_negator:
                         negation_flag = True
                         break
-                
-                # Apply negation (flip sign)
+
                 if negation_flag:
                     word_score = -word_score
-            
-            # Check for intensifier before this word
+
+            # 5) Check for intensifier directly before this word
             intensifier = 1.0
             if i > 0:
-                prev_word = tokens[i-1].lower().strip('.,!?;:\'"')
-                if prev_word in self.intensifiers:
-                    intensifier = self.intensifiers[prev_word]
-            
+                intensifier = tokens[i - 1].intensity
+
             # Apply intensifier
-            word_score *= intensifier
-            
-            total_score += word_score
-            word_count += 1
-        
-        # Normalize
-        if word_count > 0:
-            return total_score / word_count
-        return 0.0
+            contributions.append(word_score * intensifier)
+
+        return contributions
+
+    def score_contributions(self, contributions, emojis=None):
+        """Average the sentiment-bearing token contributions and emojis."""
+        total_score = 0.0
+        word_count = 0
+
+        for word_score in contributions:
+            if word_score != 0:
+                total_score += word_score
+                word_count += 1
+
+        # Emoji occurrences are not subject to negation or intensifiers
+        if emojis:
+            emoji_sentiments = self.lexicon.get_emoji_sentiments()
+            for _, _, emoji in emojis:
+                emoji_score = emoji_sentiments.get(emoji, 0.0)
+                if emoji_score != 0:
+                    total_score += emoji_score
+                    word_count += 1
+
+        # Normalize score
+        return total_score / word_count if word_count > 0 else 0.0
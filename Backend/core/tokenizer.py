@@ -0,0 +1,84 @@
+"""
+Tokenizers - pluggable word tokenization for the analysis pipeline
+"""
+import re
+from typing import List
+
+# Characters that always form a token of their own
+_SPLIT = r""";@#$%&?!()\[\]{}<>*«»“”‘’„"""
+
+_TOKEN = re.compile(r"""
+    \.{2,}                               # ellipsis
+  | --                                   # double dash
+  | `+                                   # backtick quotes
+  | ''|"                                 # straight double quotes
+  | [%(split)s]                          # single punctuation
+  | (?:                                  # word
+        [^\s%(split)s"`,:.'\-]
+      | [,:](?=\d)                       # 1,000  10:30
+      | \.(?=[^\s.%(split)s"`'])         # U.S.A  3.5  x.com
+      | '(?=\w)                          # don't  'hello  rock'n'roll
+      | -(?!-)
+    )+
+  | [,:.']                               # trailing punctuation
+""" % {'split': _SPLIT}, re.VERBOSE)
+
+# Opening double quotes follow these (or start the text)
+_OPENERS = frozenset(' \t\n\r\f\v([{<')
+
+
+class NLTKTokenizer:
+    """NLTK ``word_tokenize`` (Punkt sentences + Treebank rules)"""
+
+    name = 'nltk'
+
+    def __init__(self):
+        # Imported on first use so the fast tokenizer never loads NLTK
+        from nltk.tokenize import word_tokenize
+        self._tokenize = word_tokenize
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._tokenize(text)
+
+
+class FastTokenizer:
+    """
+    Single precompiled-regex tokenizer, no NLTK data needed.
+
+    Follows ``word_tokenize`` for punctuation, quotes (``/''), hashtags,
+    mentions, numbers and emoji runs, but keeps contractions whole
+    ("don't", "can't", "cannot") so they match SentimentScorer.negations.
+    Abbreviation periods are always split off before whitespace, as an
+    untrained Punkt model does.
+    """
+
+    name = 'fast'
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = []
+        for match in _TOKEN.finditer(text):
+            token = match.group()
+            if token == '"' or token == "''":
+                start = match.start()
+                if start == 0 or text[start - 1] in _OPENERS:
+                    token = '``'
+                else:
+                    token = "''"
+            tokens.append(token)
+        return tokens
+
+
+TOKENIZERS = {
+    NLTKTokenizer.name: NLTKTokenizer,
+    FastTokenizer.name: FastTokenizer,
+}
+
+
+def get_tokenizer(tokenizer='nltk'):
+    """Return a tokenizer instance from a name or an object with ``tokenize``"""
+    if hasattr(tokenizer, 'tokenize'):
+        return tokenizer
+    try:
+        return TOKENIZERS[tokenizer]()
+    except KeyError:
+        raise ValueError(f'Unknown tokenizer: {tokenizer}') from None
@@ -0,0 +1,44 @@
+"""
+Token representation shared by the WSD, scoring and breakdown stages
+"""
+from typing import List
+
+# Punctuation stripped from both ends of a token before any lookup
+STRIP_CHARS = '.,!?;:\'"'
+
+
+def normalize(token: str) -> str:
+    """Normalize a raw token for lexicon and clue lookups."""
+    return token.lower().strip(STRIP_CHARS)
+
+
+class Token:
+    """A token normalized once per document.
+
+    raw:          token as produced by the tokenizer
+    norm:         lowercased token with surrounding punctuation stripped
+    score:        lexicon sentiment score of ``norm`` (0.0 if none)
+    is_negator:   True if ``norm`` is a negation word
+    intensity:    intensifier multiplier of ``norm`` (1.0 if none)
+    """
+
+    __slots__ = ('raw', 'norm', 'score', 'is_negator', 'intensity')
+
+    def __init__(self, raw, norm, score=0.0, is_negator=False, intensity=1.0):
+        self.raw = raw
+        self.norm = norm
+        self.score = score
+        self.is_negator = is_negator
+        self.intensity = intensity
+
+    @property
+    def is_intensifier(self) -> bool:
+        return self.intensity != 1.0
+
+    def __repr__(self):
+        return f"Token({self.raw!r}, norm={self.norm!r}, score={self.score})"
+
+
+def normalized_forms(tokens) -> List[str]:
+    """Return normalized forms for raw strings or prepared ``Token`` objects."""
+    return [t.norm if isinstance(t, Token) else normalize(t) for t in tokens]
@@ -2,7 +2,11 @@
 Word Sense Disambiguation Engine
 Context-aware word sense detection
 """
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Tuple
+
+from .senses import SenseMap
+from .tokens import normalized_forms
 
 
 class WSDEngine:
@@ -69,56 +73,115 @@ class WSDEngine:
         }
 
         self.sense_inventory = self._load_sense_inventory()
+        self.compile_index()
 
-    def disambiguate(self, tokens: List[str]) -> Dict[int, Dict]:
-        """Disambiguate word senses in context for a token list."""
-        senses: Dict[int, Dict] = {}
+    def compile_index(self) -> None:
+        """
+        Compile context clues into a lookup index.
 
-        for i, token in enumerate(tokens):
-            # Context window
-            context_start = max(0, i - self.window_size)
-            context_end = min(len(tokens), i + self.window_size + 1)
-            context = tokens[context_start:context_end]
-            context_lower = [t.lower().strip('.,!?;:\'"') for t in context]
-
-            token_lower = token.lower().strip('.,!?;:\'"')
-            possible_senses = self.sense_inventory.get(token_lower, [token_lower])
-
-            if len(possible_senses) == 1:
-                senses[i] = {
-                    'word': token,
-                    'sense': possible_senses[0],
-                    'confidence': 1.0,
-                    'context': context
-                }
-            else:
-                best_sense = self._select_sense_by_context(
+        Maps each clue word to the (ambiguous word, sense) pairs it supports,
+        so a context window is scored by counting instead of scanning clue
+        lists. Call again after editing ``context_clues`` or the inventory.
+        """
+        index: Dict[str, List[Tuple[str, str]]] = {}
+        for word, clues in self.context_clues.items():
+            for sense, keywords in clues.items():
+                for keyword in set(keywords):
+                    index.setdefault(keyword, []).append((word, sense))
+
+        self._clue_index = {k: tuple(v) for k, v in index.items()}
+        self._sense_labels = frozenset(
+            sense for senses in self.sense_inventory.values() for sense in senses
+        )
+        self._max_label_len = max((len(s) for s in self._sense_labels), default=0)
+
+    def freeze(self) -> None:
+        """
+        Turn the clue lists and sense inventory into read-only tuples and
+        mappings (see UniversalWSDAnalyzer.freeze).
+        """
+        self.context_clues = MappingProxyType({
+            word: MappingProxyType({sense: tuple(keywords) for sense, keywords in clues.items()})
+            for word, clues in self.context_clues.items()
+        })
+        self.sense_inventory = MappingProxyType({
+            word: tuple(senses) for word, senses in self.sense_inventory.items()
+        })
+        self.compile_index()
+
+    def disambiguate(self, tokens: List[str]) -> SenseMap:
+        """
+        Disambiguate word senses for raw tokens or prepared ``Token`` objects.
+
+        Runs in O(n): per-sense clue counters are updated as the context
+        window slides over the document instead of rescanning each window.
+        Only ambiguous positions are stored; use ``SenseMap.to_dict`` for
+        the per-token view with context windows.
+        """
+        senses = SenseMap(tokens, self.sense_inventory, self.window_size)
+        normalized = normalized_forms(tokens)
+        n = len(normalized)
+        window = self.window_size
+
+        ambiguous = {
+            i for i, word in enumerate(normalized)
+            if len(self.sense_inventory.get(word, ())) > 1
+        }
+
+        # Counter keys: (word, sense) for clue hits, sense label for prefix hits
+        counts: Dict = {}
+        keys_for: Dict[str, Tuple] = {}
+
+        def update(position: int, delta: int) -> None:
+            word = normalized[position]
+            keys = keys_for.get(word)
+            if keys is None:
+                keys = keys_for[word] = self._counter_keys(word)
+            for key in keys:
+                counts[key] = counts.get(key, 0) + delta
+
+        if ambiguous:
+            for j in range(min(n, window + 1)):
+                update(j, 1)
+
+        for i in range(n):
+            if i in ambiguous:
+                token_lower = normalized[i]
+                possible_senses = self.sense_inventory[token_lower]
+                best_sense = self._select_sense(token_lower, possible_senses, counts)
+                confidence = self._sense_confidence(
                     token_lower,
-                    context_lower,
-                    possible_senses
-                )
-                confidence = self._calculate_sense_confidence(
                     best_sense,
-                    context_lower,
-                    token_lower
+                    counts,
+                    min(n, i + window + 1) - max(0, i - window)
                 )
+                senses.add(i, best_sense, confidence)
 
-                senses[i] = {
-                    'word': token,
-                    'sense': best_sense,
-                    'confidence': confidence,
-                    'context': context
-                }
+            # Slide the window one position to the right
+            if ambiguous:
+                if i - window >= 0:
+                    update(i - window, -1)
+                if i + window + 1 < n:
+                    update(i + window + 1, 1)
 
         return senses
 
-    def _select_sense_by_context(
+    def _counter_keys(self, word: str) -> Tuple:
+        """Counter keys a context word contributes to."""
+        keys = list(self._clue_index.get(word, ()))
+        # Sense labels matched by the confidence score (c == sense or prefix)
+        for length in range(1, min(len(word), self._max_label_len) + 1):
+            if word[:length] in self._sense_labels:
+                keys.append(word[:length])
+        return tuple(keys)
+
+    def _select_sense(
         self,
         word: str,
-        context: List[str],
-        possible_senses: List[str]
+        possible_senses: List[str],
+        counts: Dict
     ) -> str:
-        """Select best sense using context clues."""
+        """Select best sense using context clue counts for the window."""
         if word in self.context_clues:
             clues = self.context_clues[word]
 
@@ -126,10 +189,9 @@ class WSDEngine:
             sense_scores = {sense: 0 for sense in possible_senses}
 
             # Accumulate matches for each sense
-            for sense_type, sense_keywords in clues.items():
-                score = sum(1 for c in context if c in sense_keywords)
+            for sense_type in clues:
                 if sense_type in sense_scores:
-                    sense_scores[sense_type] += score
+                    sense_scores[sense_type] += counts.get((word, sense_type), 0)
 
             # If any sense has > 0 score, choose best
             if max(sense_scores.values()) > 0:
@@ -142,24 +204,23 @@ class WSDEngine:
         # Fallback: first sense in inventory
         return possible_senses[0]
 
-    def _calculate_sense_confidence(
+    def _sense_confidence(
         self,
+        word: str,
         sense: str,
-        context: List[str],
-        word: str
+        counts: Dict,
+        context_size: int
     ) -> float:
         """Calculate confidence in sense selection."""
-        if not context:
+        if not context_size:
             return 0.6
 
-        match_count = len([c for c in context if c == sense or c.startswith(sense)])
+        match_count = counts.get(sense, 0)
 
         if word in self.context_clues:
-            sense_keywords = self.context_clues[word].get(sense, [])
-            keyword_matches = sum(1 for c in context if c in sense_keywords)
-            match_count += keyword_matches
+            match_count += counts.get((word, sense), 0)
 
-        base_confidence = min(1.0, max(0.55, match_count / max(len(context), 1)))
+        base_confidence = min(1.0, max(0.55, match_count / max(context_size, 1)))
 
         return round(base_confidence, 2)
 
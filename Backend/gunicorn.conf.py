@@ -0,0 +1,29 @@
+"""
+Gunicorn settings - build the analyzer once in the master and share it
+
+With preload_app (PRELOAD_APP=1, the default) the master imports the app,
+warms the analyzer up and freezes its tables before forking, so workers
+share those pages copy-on-write. Otherwise each worker warms itself up
+before it accepts traffic.
+"""
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:' + os.environ.get('PORT', '5000'))
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+preload_app = os.environ.get('PRELOAD_APP', '1') == '1'
+
+WARM_UP_URL_STACK = os.environ.get('WARM_UP_URL_STACK') == '1'
+
+
+def when_ready(server):
+    """Preload and freeze the shared tables in the master, before forking"""
+    if server.cfg.preload_app:
+        services = server.app.wsgi().extensions['services']
+        services.preload(url_stack=WARM_UP_URL_STACK)
+
+
+def post_worker_init(worker):
+    """Load tokenizer models, lexicons and indexes in the new worker"""
+    services = worker.wsgi.extensions['services']
+    if not services.preloaded:
+        services.warm_up(url_stack=WARM_UP_URL_STACK)
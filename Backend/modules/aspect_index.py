@@ -0,0 +1,113 @@
+"""
+Aspect Index - Product aspect terms compiled into a token-level index
+"""
+import json
+import os
+
+# Aspect dictionary: category -> aspect -> terms (single or multi-word).
+# Aspects under 'general' apply to every category.
+DEFAULT_ASPECTS = {
+    'general': {
+        'quality': ['quality', 'build quality', 'craftsmanship', 'material', 'materials'],
+        'price': ['price', 'prices', 'priced', 'pricing', 'cost', 'costs'],
+        'shipping': ['shipping', 'shipment', 'delivery', 'delivered', 'arrived'],
+        'service': ['service', 'customer service', 'support', 'seller'],
+        'packaging': ['packaging', 'packaged', 'package', 'packing'],
+        'durability': ['durability', 'durable', 'sturdy', 'lasted', 'lasts'],
+        'design': ['design', 'designed', 'style', 'appearance'],
+        'value': ['value', 'value for money', 'worth'],
+    },
+    'electronics': {
+        'battery': ['battery', 'battery life', 'charge', 'charging'],
+        'screen': ['screen', 'display', 'resolution'],
+        'performance': ['performance', 'speed', 'lag', 'laggy'],
+        'sound': ['sound', 'audio', 'speaker', 'speakers', 'volume'],
+    },
+    'clothing': {
+        'fit': ['fit', 'fits', 'sizing', 'size'],
+        'fabric': ['fabric', 'cotton', 'stitching'],
+        'comfort': ['comfort', 'comfortable'],
+    },
+}
+
+
+class AspectIndex:
+    """
+    Token-level aspect matcher.
+
+    Terms are indexed by their first token; matching walks the document's
+    normalized tokens once and takes the longest term at each position, so
+    the cost does not grow with the number of aspect terms.
+    """
+
+    def __init__(self, aspects=None):
+        self.aspects = aspects if aspects is not None else DEFAULT_ASPECTS
+        self._indexes = {}
+
+    @classmethod
+    def load(cls, path=None):
+        """Load an aspect dictionary from JSON (path or ASPECT_LEXICON)"""
+        path = path or os.environ.get('ASPECT_LEXICON')
+        if not path:
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def categories(self):
+        return list(self.aspects)
+
+    def compile_all(self):
+        """Compile the index of every category up front"""
+        for category in [None] + self.categories():
+            if category not in self._indexes:
+                self._indexes[category] = self._compile(category)
+
+    def _compile(self, category):
+        """Build first token -> [(term tokens, aspect)] for a category"""
+        index = {}
+        groups = [self.aspects.get('general', {})]
+        if category and category != 'general':
+            groups.append(self.aspects.get(category, {}))
+        for group in groups:
+            for aspect, terms in group.items():
+                for term in terms:
+                    words = tuple(term.lower().split())
+                    if words:
+                        index.setdefault(words[0], []).append((words, aspect))
+        # Longest terms first so multi-word terms win
+        for entries in index.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+        return index
+
+    def match(self, words, category=None):
+        """
+        Find aspect mentions in normalized tokens.
+
+        Returns (start, end, aspect) spans over ``words``, non-overlapping.
+        Unknown categories match the 'general' aspects only.
+        """
+        if category not in self.aspects:
+            # Only known categories get an index of their own
+            category = None
+        index = self._indexes.get(category)
+        if index is None:
+            index = self._indexes[category] = self._compile(category)
+
+        mentions = []
+        n = len(words)
+        i = 0
+        while i < n:
+            entries = index.get(words[i])
+            matched = None
+            if entries:
+                for term, aspect in entries:
+                    end = i + len(term)
+                    if end <= n and tuple(words[i:end]) == term:
+                        matched = (i, end, aspect)
+                        break
+            if matched:
+                mentions.append(matched)
+                i = matched[1]
+            else:
+                i += 1
+        return mentions
@@ -0,0 +1,35 @@
+"""
+Batch Summary - Running sentiment counts for batch and streaming analysis
+"""
+
+
+class BatchSummary:
+    """Accumulate the batch summary one result at a time"""
+    
+    def __init__(self):
+        self.total = 0
+        self.positive = 0
+        self.negative = 0
+        self.neutral = 0
+        self.confidence_sum = 0.0
+    
+    def add(self, result):
+        """Add one analysis result (error results count with confidence 0)"""
+        self.total += 1
+        sentiment = result.get('sentiment')
+        if sentiment == 'POSITIVE':
+            self.positive += 1
+        elif sentiment == 'NEGATIVE':
+            self.negative += 1
+        elif sentiment == 'NEUTRAL':
+            self.neutral += 1
+        self.confidence_sum += result.get('confidence', 0)
+    
+    def to_dict(self):
+        """Summary in the shape returned by the batch endpoints"""
+        return {
+            'positive': self.positive,
+            'negative': self.negative,
+            'neutral': self.neutral,
+            'average_confidence': round(self.confidence_sum / max(self.total, 1), 2)
+        }
@@ -0,0 +1,356 @@
+"""
+Bulk Analyzer - Analyze JSONL / CSV corpora from the command line
+
+    python -m modules.bulk_analyze reviews.jsonl -o results.ndjson --workers 8
+    python -m modules.bulk_analyze tweets.csv -o out.ndjson --mode social --unordered
+    cat posts.jsonl | python -m modules.bulk_analyze - > out.ndjson
+
+Input rows are a JSON string or object per line (JSONL), or CSV rows with
+a header; the text is read from --text-field and an optional id from
+--id-field. Rows are analyzed in chunks across --workers processes with
+at most --max-in-flight chunks outstanding, so memory stays flat on any
+input size. Each output line is the analysis result plus "row" (1-based
+input row) and "id".
+
+With --checkpoint, progress is saved every few seconds; rerunning the
+same command resumes after the last saved chunk (the output file is
+truncated to the matching size first).
+"""
+import argparse
+import csv
+import gc
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from core.analyzer import UniversalWSDAnalyzer
+from modules.validator import InputValidator
+from modules.json_provider import dumps
+
+FORMATS = ('jsonl', 'csv')
+
+# Analyzer owned by each worker process
+_analyzer = None
+
+
+def _load_analyzer(tokenizer):
+    global _analyzer
+    _analyzer = UniversalWSDAnalyzer(tokenizer=tokenizer)
+
+
+def _init_worker(tokenizer):
+    # Ctrl-C is handled by the parent, which saves the checkpoint
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if _analyzer is None:
+        # Spawned worker; forked ones inherit the parent's frozen analyzer
+        _load_analyzer(tokenizer)
+
+
+def _analyze_texts(texts, mode, options):
+    """Analyze one chunk of texts (None = invalid row) in a worker"""
+    results = []
+    for text in texts:
+        if text is None:
+            results.append({'error': 'Invalid text', 'success': False})
+        else:
+            results.append(_analyzer.analyze_one(text.strip(), mode, **options))
+    return results
+
+
+def detect_format(path):
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def read_rows(stream, fmt='jsonl', text_field='text', id_field='id'):
+    """Yield (id, text) per input row; text is None for invalid rows"""
+    if fmt == 'csv':
+        for record in csv.DictReader(stream):
+            text = record.get(text_field)
+            yield record.get(id_field), text if InputValidator.validate_text(text) else None
+        return
+
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield None, None
+            continue
+        item_id, text = None, item
+        if isinstance(item, dict):
+            item_id, text = item.get(id_field), item.get(text_field)
+        yield item_id, text if InputValidator.validate_text(text) else None
+
+
+def chunked(rows, size):
+    """Yield (chunk index, rows) in chunks of ``size``"""
+    chunk = []
+    index = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield index, chunk
+            index += 1
+            chunk = []
+    if chunk:
+        yield index, chunk
+
+
+class Checkpoint:
+    """
+    Resumable progress of one job: the chunks written so far and the
+    output size after them. ``done`` is every chunk below ``prefix`` plus
+    the (unordered) chunks in ``extra``.
+    """
+
+    def __init__(self, path, job):
+        self.path = path
+        self.job = job
+        self.prefix = 0
+        self.extra = set()
+        self.rows = 0
+        self.output_bytes = 0
+
+    @classmethod
+    def load(cls, path, job):
+        checkpoint = cls(path, job)
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data['job'] != job:
+                raise ValueError(f'Checkpoint {path} belongs to a different job')
+            checkpoint.prefix = data['prefix']
+            checkpoint.extra = set(data['extra'])
+            checkpoint.rows = data['rows']
+            checkpoint.output_bytes = data['output_bytes']
+        return checkpoint
+
+    def is_done(self, index):
+        return index < self.prefix or index in self.extra
+
+    def mark(self, index, rows, output_bytes):
+        self.extra.add(index)
+        while self.prefix in self.extra:
+            self.extra.discard(self.prefix)
+            self.prefix += 1
+        self.rows += rows
+        self.output_bytes = output_bytes
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'job': self.job,
+                'prefix': self.prefix,
+                'extra': sorted(self.extra),
+                'rows': self.rows,
+                'output_bytes': self.output_bytes,
+            }, f)
+        os.replace(tmp, self.path)
+
+
+class BulkAnalyzer:
+    """
+    Runs chunks of rows through a process pool and writes NDJSON records,
+    in input order or as chunks finish (``ordered=False``).
+    """
+
+    def __init__(self, mode='general', options=None, workers=None, chunk_size=256,
+                 max_in_flight=None, ordered=True, tokenizer='nltk',
+                 checkpoint=None, checkpoint_interval=5.0,
+                 progress=None, progress_interval=2.0):
+        self.mode = mode
+        self.options = options or {}
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.ordered = ordered
+        self.tokenizer = tokenizer
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.progress = progress
+        self.progress_interval = progress_interval
+
+    def run(self, rows, output):
+        """Analyze ``rows`` ((id, text) pairs) into the binary ``output``; returns rows written"""
+        checkpoint = self.checkpoint or Checkpoint(None, None)
+        self._output = output
+        self._checkpoint = checkpoint
+        self._written = 0
+        self._started = self._last_report = self._last_save = time.perf_counter()
+
+        chunks = ((i, chunk) for i, chunk in chunked(rows, self.chunk_size)
+                  if not checkpoint.is_done(i))
+        try:
+            if self.workers <= 1:
+                _load_analyzer(self.tokenizer)
+                for index, chunk in chunks:
+                    self._write(index, chunk, _analyze_texts(
+                        [text for _, text in chunk], self.mode, self.options))
+            else:
+                self._run_pool(chunks)
+        finally:
+            output.flush()
+            checkpoint.save()
+            self._report(force=True)
+        return self._written
+
+    def _run_pool(self, chunks):
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        if context.get_start_method() == 'fork':
+            # Build the tables once; forked workers share them copy-on-write
+            _load_analyzer(self.tokenizer)
+            _analyzer.freeze()
+            gc.freeze()
+        pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(self.tokenizer,))
+        pending = {}  # future -> (index, chunk), in submission order
+        try:
+            for index, chunk in chunks:
+                if len(pending) >= self.max_in_flight:
+                    self._drain(pending)
+                future = pool.submit(_analyze_texts, [text for _, text in chunk],
+                                     self.mode, self.options)
+                pending[future] = (index, chunk)
+            while pending:
+                self._drain(pending)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            gc.unfreeze()
+
+    def _drain(self, pending):
+        """Write at least one finished chunk"""
+        if self.ordered:
+            future = next(iter(pending))
+            finished = [future]
+            future.result()
+        else:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            index, chunk = pending.pop(future)
+            self._write(index, chunk, future.result())
+
+    def _write(self, index, chunk, results):
+        lines = []
+        row = index * self.chunk_size
+        for (item_id, _), result in zip(chunk, results):
+            row += 1
+            record = {'row': row, **result}
+            if item_id is not None:
+                record['id'] = item_id
+            lines.append(dumps(record))
+        self._output.write(('\n'.join(lines) + '\n').encode('utf-8'))
+        self._written += len(chunk)
+
+        self._checkpoint.mark(index, len(chunk), self._tell())
+        now = time.perf_counter()
+        if self._checkpoint.path and now - self._last_save >= self.checkpoint_interval:
+            # Only records that reached the file may be covered by a checkpoint
+            self._output.flush()
+            self._checkpoint.save()
+            self._last_save = now
+        self._report()
+
+    def _tell(self):
+        try:
+            return self._output.tell()
+        except (OSError, ValueError):
+            return 0
+
+    def _report(self, force=False):
+        now = time.perf_counter()
+        if self.progress is None or (not force and now - self._last_report < self.progress_interval):
+            return
+        self._last_report = now
+        elapsed = now - self._started
+        rate = self._written / elapsed if elapsed else 0.0
+        self.progress.write(f"{self._checkpoint.rows} rows done, {rate:.0f} rows/s\n")
+        self.progress.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a JSONL or CSV corpus into NDJSON")
+    parser.add_argument('input', help="input file, or - for stdin")
+    parser.add_argument('-o', '--output', help="output NDJSON file (default: stdout)")
+    parser.add_argument('--format', choices=FORMATS, help="input format (default: from extension)")
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--id-field', default='id')
+    parser.add_argument('--mode', default='general', choices=['general', 'product', 'social'])
+    parser.add_argument('--detail', default='full', choices=['minimal', 'standard', 'full'])
+    parser.add_argument('--fields', help="comma-separated result fields")
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=256)
+    parser.add_argument('--max-in-flight', type=int, help="chunks outstanding (default: 2 x workers)")
+    parser.add_argument('--unordered', action='store_true', help="write chunks as they finish")
+    parser.add_argument('--checkpoint', help="progress file; rerun with it to resume")
+    parser.add_argument('--checkpoint-every', type=float, default=5.0, help="seconds between saves")
+    parser.add_argument('--quiet', action='store_true', help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    if args.checkpoint and not args.output:
+        parser.error('--checkpoint needs --output')
+    if args.checkpoint and args.input == '-':
+        # Resuming skips rows by position, which needs the same input again
+        parser.error('--checkpoint needs an input file, not stdin')
+
+    options = {'detail': args.detail}
+    if args.fields:
+        options['fields'] = args.fields.split(',')
+    fmt = args.format or detect_format(args.input)
+    csv.field_size_limit(sys.maxsize)
+    job = {
+        'input': os.path.abspath(args.input) if args.input != '-' else '-',
+        'format': fmt, 'mode': args.mode, 'options': options,
+        'chunk_size': args.chunk_size, 'text_field': args.text_field,
+        'id_field': args.id_field, 'tokenizer': args.tokenizer,
+    }
+    try:
+        checkpoint = Checkpoint.load(args.checkpoint, job)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.input == '-':
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    else:
+        source = open(args.input, encoding='utf-8', newline='')
+
+    if args.output:
+        mode = 'r+b' if checkpoint.output_bytes and os.path.exists(args.output) else 'wb'
+        output = open(args.output, mode)
+        # Drop records written after the last checkpoint; they are redone
+        output.truncate(checkpoint.output_bytes if mode == 'r+b' else 0)
+        output.seek(0, os.SEEK_END)
+    else:
+        output = sys.stdout.buffer
+
+    bulk = BulkAnalyzer(
+        mode=args.mode, options=options, workers=args.workers, chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight, ordered=not args.unordered,
+        tokenizer=args.tokenizer, checkpoint=checkpoint,
+        checkpoint_interval=args.checkpoint_every,
+        progress=None if args.quiet else sys.stderr
+    )
+    try:
+        bulk.run(read_rows(source, fmt, args.text_field, args.id_field), output)
+    except KeyboardInterrupt:
+        sys.stderr.write(f"Interrupted; {checkpoint.rows} rows saved\n")
+        return 130
+    finally:
+        source.close()
+        if output is not sys.stdout.buffer:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
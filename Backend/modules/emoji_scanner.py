@@ -0,0 +1,99 @@
+"""
+Emoji Scanner - Find every emoji occurrence in one pass
+"""
+import re
+from collections import Counter
+
+# Variation selectors (text/emoji presentation) are ignored when matching,
+# so '❤' and '❤️' both match the '❤️' entry
+VARIATION_SELECTORS = frozenset('\ufe0e\ufe0f')
+ZWJ = '\u200d'
+KEYCAP = '\u20e3'
+
+_END = ''  # trie key marking a complete emoji
+
+
+def _is_modifier(ch):
+    """Code points that extend the preceding emoji within one grapheme"""
+    cp = ord(ch)
+    return (
+        ch in VARIATION_SELECTORS
+        or ch == KEYCAP
+        or 0x1F3FB <= cp <= 0x1F3FF     # skin tones
+        or 0xE0020 <= cp <= 0xE007F     # tag sequences (flags)
+    )
+
+
+class EmojiScanner:
+    """
+    Multi-pattern emoji matcher compiled from an emoji sentiment table.
+
+    Patterns are stored in a code point trie; a regex over the possible
+    first code points jumps straight to candidate positions, so a scan is
+    one pass over the text however large the table grows. Matches are
+    leftmost-longest and cover the whole grapheme cluster (skin tones,
+    variation selectors and ZWJ sequences), so '👍🏽' counts once as '👍'.
+    """
+
+    def __init__(self, emoji_table):
+        self._root = {}
+        for emoji in emoji_table:
+            key = ''.join(ch for ch in emoji if ch not in VARIATION_SELECTORS)
+            if not key:
+                continue
+            node = self._root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = emoji
+        starts = ''.join(ch for ch in self._root if ch)
+        self._start_re = re.compile('[' + re.escape(starts) + ']') if starts else None
+
+    def scan(self, text):
+        """Return (start, end, emoji) for each occurrence, in text order"""
+        matches = []
+        if self._start_re is None:
+            return matches
+        n = len(text)
+        search = self._start_re.search
+        found = search(text)
+        while found is not None:
+            i = found.start()
+            node = self._root
+            j = i
+            best = None
+            while j < n:
+                ch = text[j]
+                if ch in VARIATION_SELECTORS:
+                    j += 1
+                    continue
+                node = node.get(ch)
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    best = (j, node[_END])
+            if best is None:
+                found = search(text, i + 1)
+                continue
+            end = self._cluster_end(text, best[0])
+            matches.append((i, end, best[1]))
+            found = search(text, end)
+        return matches
+
+    def counts(self, text):
+        """Occurrence count per emoji table entry"""
+        return Counter(emoji for _, _, emoji in self.scan(text))
+
+    @staticmethod
+    def _cluster_end(text, j):
+        """Extend a match over modifiers and ZWJ-joined code points"""
+        n = len(text)
+        while j < n:
+            ch = text[j]
+            if _is_modifier(ch):
+                j += 1
+            elif ch == ZWJ and j + 1 < n:
+                j += 2
+            else:
+                break
+        return j
@@ -0,0 +1,57 @@
+"""
+Bounded Executor - Thread pool that rejects work instead of queueing forever
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised by BoundedExecutor.submit when the pool and its queue are full"""
+
+
+class BoundedExecutor:
+    """
+    ThreadPoolExecutor with at most ``max_workers`` running and
+    ``max_queue`` waiting tasks. ``submit`` raises Overloaded beyond that,
+    so callers can shed load (503) instead of letting latency grow.
+    """
+
+    def __init__(self, max_workers, max_queue, name='pool'):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise Overloaded(f'{self.name} pool is full')
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self):
+        in_flight = self._in_flight
+        return {
+            'workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': in_flight,
+            'queued': max(0, in_flight - self.max_workers),
+            'rejected': self.rejected,
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
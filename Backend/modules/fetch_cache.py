@@ -0,0 +1,261 @@
+"""
+Fetch Cache - On-disk HTTP cache of the text extracted from fetched pages
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+_MAX_AGE = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+class CacheEntry:
+    """Metadata of one cached page"""
+
+    __slots__ = ('key', 'url', 'etag', 'last_modified', 'expires', 'size')
+
+    def __init__(self, key, url, etag=None, last_modified=None, expires=0.0, size=0):
+        self.key = key
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.size = size
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires
+
+    def validators(self):
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'expires': self.expires
+        }
+
+
+class FetchCache:
+    """
+    URL -> extracted text cache on disk.
+
+    Each entry is two files named by the URL hash: metadata (validators
+    and expiry) and the extracted text; the HTML itself is not kept, since
+    a hit or a 304 never needs to parse it again. Freshness follows
+    Cache-Control max-age / no-cache / no-store and Expires, with
+    ``default_ttl`` when the server gives neither.
+
+    The directory may be shared by several worker processes. Size is
+    therefore accounted from the directory itself: it is re-read whenever
+    this process's running estimate crosses ``max_bytes`` or is older than
+    ``SCAN_INTERVAL`` seconds, and entries are then evicted least recently
+    used first (the metadata file's mtime is the last access time).
+    """
+
+    # Seconds between directory scans; other workers' writes are counted
+    # by the next scan
+    SCAN_INTERVAL = 30.0
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, default_ttl=3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Totals of the directory at the last scan, plus this process's writes
+        self._entries = 0
+        self._bytes = 0
+        self._scanned = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """Read the directory; returns [(last access, key, size)] per entry"""
+        sizes = {}
+        accessed = {}
+        with os.scandir(self.directory) as items:
+            for item in items:
+                key, _, ext = item.name.partition('.')
+                # Skips in-progress .tmp writes; other files are entries
+                if ext.endswith('.tmp'):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                sizes[key] = sizes.get(key, 0) + stat.st_size
+                if ext == 'json':
+                    accessed[key] = stat.st_mtime
+        # Files without metadata (e.g. left by an older version) go first
+        entries = [(accessed.get(key, 0.0), key, size) for key, size in sizes.items()]
+        with self._lock:
+            self._entries = len(entries)
+            self._bytes = sum(size for _, _, size in entries)
+            self._scanned = time.monotonic()
+        return entries
+
+    @staticmethod
+    def make_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, f'{key}.{ext}')
+
+    def _file_size(self, key, ext):
+        try:
+            return os.path.getsize(self._path(key, ext))
+        except OSError:
+            return 0
+
+    def _write(self, key, ext, data):
+        path = self._path(key, ext)
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return len(data.encode('utf-8'))
+
+    def _read(self, key, ext):
+        try:
+            with open(self._path(key, ext), encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def expiry(self, headers, now=None):
+        """Absolute expiry time from response headers, or None for no-store"""
+        now = now or time.time()
+        control = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in control:
+            return None
+        if 'no-cache' in control:
+            return now
+        match = _MAX_AGE.search(control)
+        if match:
+            return now + int(match.group(1))
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                return parsedate_to_datetime(expires).timestamp()
+            except (TypeError, ValueError):
+                return now
+        return now + self.default_ttl
+
+    def get(self, url):
+        """Return the CacheEntry for a URL, or None"""
+        key = self.make_key(url)
+        raw = self._read(key, 'json')
+        if raw is None:
+            return None
+        try:
+            meta = json.loads(raw)
+        except ValueError:
+            return None
+        if meta.get('url') != url:
+            return None
+        return CacheEntry(
+            key, url, meta.get('etag'), meta.get('last_modified'),
+            meta.get('expires', 0.0)
+        )
+
+    def text(self, entry):
+        """Extracted text of an entry (marks it as recently used)"""
+        text = self._read(entry.key, 'txt')
+        if text is not None:
+            try:
+                os.utime(self._path(entry.key, 'json'))
+            except OSError:
+                pass
+        return text
+
+    def put(self, url, headers, text):
+        """Store the extracted text of a 200 response"""
+        expires = self.expiry(headers)
+        if expires is None:
+            return None
+        key = self.make_key(url)
+        entry = CacheEntry(
+            key, url, headers.get('ETag'), headers.get('Last-Modified'), expires
+        )
+        if not entry.validators() and not entry.is_fresh():
+            return None
+        old_size = self._file_size(key, 'txt') + self._file_size(key, 'json')
+        size = self._write(key, 'txt', text)
+        size += self._write(key, 'json', json.dumps(entry.to_dict()))
+        entry.size = size
+        self._account(key, size - old_size, old_size == 0)
+        return entry
+
+    def refresh(self, entry, headers):
+        """Update expiry (and validators) after a 304 Not Modified"""
+        expires = self.expiry(headers)
+        entry.expires = expires if expires is not None else 0.0
+        entry.etag = headers.get('ETag') or entry.etag
+        entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        self._write(entry.key, 'json', json.dumps(entry.to_dict()))
+
+    def record(self, outcome):
+        """Count a lookup outcome: 'hit', 'revalidated' or 'miss'"""
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def _account(self, key, delta, added):
+        with self._lock:
+            self._bytes += delta
+            self._entries += added
+            due = (self._bytes > self.max_bytes
+                   or time.monotonic() - self._scanned > self.SCAN_INTERVAL)
+        if not due:
+            return
+        # Other workers write to the same directory: evict from what is on disk
+        entries = self._scan()
+        total = sum(size for _, _, size in entries)
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        for _, victim, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if victim == key:
+                continue
+            self._remove(victim)
+            total -= size
+            removed += 1
+        with self._lock:
+            self._bytes = total
+            self._entries -= removed
+
+    def _remove(self, key):
+        for ext in ('json', 'txt', 'html'):
+            try:
+                os.remove(self._path(key, ext))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': self._entries,
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses
+            }
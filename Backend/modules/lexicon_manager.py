@@ -1,12 +1,25 @@
 """
 Lexicon Manager - Manage sentiment words and emojis
 """
+import os
+from types import MappingProxyType
+
+from modules.emoji_scanner import EmojiScanner
+from modules.lexicon_table import LexiconTable
 
 
 class LexiconManager:
     """Manage sentiment lexicon and emoji mappings"""
     
-    def __init__(self):
+    def __init__(self, table_path=None):
+        # Bumped whenever the tables change; part of the result cache key
+        self.version = 1
+        
+        # Optional compiled table (see modules.lexicon_table) for large
+        # lexicons; the built-in words below take precedence over it
+        table_path = table_path or os.environ.get('LEXICON_TABLE')
+        self.table = LexiconTable(table_path) if table_path else None
+        
         self.positive_words = {
             'good': 1.0, 'great': 1.5, 'excellent': 1.5, 'amazing': 1.5,
             'awesome': 1.5, 'wonderful': 1.5, 'fantastic': 1.5,
@@ -67,19 +80,50 @@ class LexiconManager:
             '😞': -1.2, '😢': -1.2, '🙅': -1.1, '😠': -1.3,
             '🤬': -1.4, '💀': -1.0, '👎': -1.2, '🚫': -1.1
         }
+        
+        self._merge_words()
     
     def get_sentiment_score(self, word):
         """Get sentiment score for a word"""
         word = word.lower()
         word = word.strip('.,!?;:\'"')
-        
-        if word in self.positive_words:
-            return self.positive_words[word]
-        elif word in self.negative_words:
-            return self.negative_words[word]
-        else:
-            return 0.0
+        return self.lookup(word)
+    
+    def lookup(self, word):
+        """Get sentiment score for an already normalized word"""
+        score = self._scores.get(word)
+        if score is not None:
+            return score
+        if self.table is not None:
+            return self.table.get(word, 0.0)
+        return 0.0
+    
+    def mark_updated(self):
+        """Call after editing the word or emoji tables"""
+        self.version += 1
+        self._merge_words()
+    
+    def _merge_words(self):
+        """Merge word tables into one lookup dict (positive wins on overlap)"""
+        self._scores = {**self.negative_words, **self.positive_words}
+        self._emoji_scanner = None
+    
+    def freeze(self):
+        """
+        Make the word and emoji tables read-only (see
+        UniversalWSDAnalyzer.freeze); edits after this raise TypeError.
+        """
+        self.get_emoji_scanner()
+        self.positive_words = MappingProxyType(self.positive_words)
+        self.negative_words = MappingProxyType(self.negative_words)
+        self.emoji_sentiments = MappingProxyType(self.emoji_sentiments)
     
     def get_emoji_sentiments(self):
         """Get emoji sentiment mappings"""
         return self.emoji_sentiments
+    
+    def get_emoji_scanner(self):
+        """Get the compiled emoji scanner (rebuilt after mark_updated)"""
+        if self._emoji_scanner is None:
+            self._emoji_scanner = EmojiScanner(self.emoji_sentiments)
+        return self._emoji_scanner
@@ -0,0 +1,151 @@
+"""
+Lexicon Table - Compiled, memory-mapped sentiment lexicon
+
+Large lexicons are compiled once into a sorted binary table and opened
+with mmap, so every worker process shares the same page-cache pages and
+lookups binary-search the file without building a Python dict.
+
+File layout (little-endian):
+    header   8s magic, u32 entry count, u32 reserved
+    offsets  (count + 1) x u32   start of each key in the key blob
+    scores   count x f32
+    keys     UTF-8 keys, sorted by their encoded bytes
+
+Build a table from a source file with one "word<TAB>score" per line:
+    python -m modules.lexicon_table lexicon.tsv lexicon.bin
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import tempfile
+
+MAGIC = b'WSDLEX01'
+HEADER = struct.Struct('<8sII')
+U32 = struct.Struct('<I')
+F32 = struct.Struct('<f')
+
+# Same normalization the analyzer applies before lookups
+STRIP_CHARS = '.,!?;:\'"'
+
+
+def read_source(path):
+    """Parse a lexicon source file into {word: score}"""
+    entries = {}
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.replace(',', '\t').split()
+            if len(parts) != 2:
+                raise ValueError(f"{path}:{line_no}: expected 'word<TAB>score'")
+            word = parts[0].lower().strip(STRIP_CHARS)
+            if word:
+                entries[word] = float(parts[1])
+    return entries
+
+
+def write_table(entries, dest):
+    """Write {word: score} as a binary table (atomically replaces dest)"""
+    keys = sorted((word.encode('utf-8'), score) for word, score in entries.items())
+
+    offsets = bytearray()
+    scores = bytearray()
+    blob = bytearray()
+    for key, score in keys:
+        offsets += U32.pack(len(blob))
+        scores += F32.pack(score)
+        blob += key
+    offsets += U32.pack(len(blob))
+
+    # Replace via rename so processes that already mapped the old file keep it
+    directory = os.path.dirname(os.path.abspath(dest))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(keys), 0))
+            f.write(offsets)
+            f.write(scores)
+            f.write(blob)
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(keys)
+
+
+def compile_lexicon(source, dest):
+    """Compile a lexicon source file into a binary table"""
+    return write_table(read_source(source), dest)
+
+
+class LexiconTable:
+    """Read-only view of a compiled lexicon table"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path}: not a compiled lexicon table")
+        self._offsets = HEADER.size
+        self._scores = self._offsets + (self._count + 1) * U32.size
+        self._keys = self._scores + self._count * F32.size
+
+    def _key(self, i):
+        start = U32.unpack_from(self._mm, self._offsets + i * U32.size)[0]
+        end = U32.unpack_from(self._mm, self._offsets + (i + 1) * U32.size)[0]
+        return self._mm[self._keys + start:self._keys + end]
+
+    def _score(self, i):
+        # float32 storage; round back to the precision lexicons are written in
+        return round(F32.unpack_from(self._mm, self._scores + i * F32.size)[0], 6)
+
+    def _find(self, word):
+        key = word.encode('utf-8', 'surrogatepass')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == key:
+            return lo
+        return -1
+
+    def get(self, word, default=None):
+        """Score for a normalized word, or default"""
+        i = self._find(word)
+        return default if i < 0 else self._score(i)
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        """Iterate (word, score) pairs in key order"""
+        for i in range(self._count):
+            yield self._key(i).decode('utf-8'), self._score(i)
+
+    def close(self):
+        self._mm.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a sentiment lexicon table")
+    parser.add_argument('source', help="text file with one 'word<TAB>score' per line")
+    parser.add_argument('dest', help="output binary table")
+    args = parser.parse_args(argv)
+    count = compile_lexicon(args.source, args.dest)
+    print(f"Wrote {count} entries to {args.dest}")
+
+
+if __name__ == '__main__':
+    main()
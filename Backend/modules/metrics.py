@@ -0,0 +1,249 @@
+"""
+Metrics - Low-overhead counters and histograms in Prometheus text format
+"""
+import threading
+from bisect import bisect_left
+
+# Latency buckets (seconds) and input-size buckets (tokens)
+SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TOKEN_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + body + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in sorted(items):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Bucketed histogram with labels (cumulative buckets on render)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, (list(s[0]), s[1], s[2])) for labels, s in self._series.items()]
+        for labels, (counts, total, count) in sorted(items):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket
+                le = (('le', _format_value(float(bound))),)
+                yield self.name + '_bucket', _format_labels(self.labelnames, labels, le), cumulative
+            yield self.name + '_sum', _format_labels(self.labelnames, labels), total
+            yield self.name + '_count', _format_labels(self.labelnames, labels), count
+
+
+class Gauge:
+    """Gauge read from a callback at render time: () -> {labels: value}"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help, labelnames, callback):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        for labels, value in sorted(self.callback().items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in Prometheus text format 0.0.4"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, prefix='wsd_'):
+        self.prefix = prefix
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(self.prefix + name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=SECONDS_BUCKETS):
+        return self._add(Histogram(self.prefix + name, help, labelnames, buckets))
+
+    def gauge(self, name, help, labelnames, callback):
+        return self._add(Gauge(self.prefix + name, help, labelnames, callback))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class Metrics:
+    """
+    Application metrics: requests, errors, per-stage latency, input sizes
+    and cache hit rates.
+
+    Request handlers ``bind`` the endpoint (and the analyzer binds the
+    mode) in a thread-local, so stage timers deep in the analyzer and
+    URL extractor are labeled without passing labels around. Stages run
+    inside process-pool workers (parallel analyze_many) are not recorded.
+    """
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        registry = self.registry
+        self.requests = registry.counter(
+            'requests_total', 'HTTP requests', ('endpoint', 'method', 'status'))
+        self.request_seconds = registry.histogram(
+            'request_seconds', 'HTTP request latency', ('endpoint',))
+        self.errors = registry.counter(
+            'errors_total', 'Failed requests and analyses', ('endpoint', 'kind'))
+        self.stage_seconds = registry.histogram(
+            'stage_seconds', 'Latency of each pipeline stage', ('endpoint', 'mode', 'stage'))
+        self.input_tokens = registry.histogram(
+            'input_tokens', 'Tokens per analyzed document', ('endpoint', 'mode'),
+            buckets=TOKEN_BUCKETS)
+        self._caches = {}
+        self._executors = {}
+        registry.gauge('cache_hits', 'Cache hits', ('cache',),
+                       lambda: self._cache_stat('hits'))
+        registry.gauge('cache_misses', 'Cache misses', ('cache',),
+                       lambda: self._cache_stat('misses'))
+        registry.gauge('cache_hit_rate', 'Cache hit rate', ('cache',),
+                       lambda: self._cache_stat('hit_rate'))
+        registry.gauge('executor_in_flight', 'Running and queued requests per pool', ('pool',),
+                       lambda: self._executor_stat('in_flight'))
+        registry.gauge('executor_rejected', 'Requests rejected with 503 per pool', ('pool',),
+                       lambda: self._executor_stat('rejected'))
+        self._local = threading.local()
+
+    def bind(self, endpoint=None, mode=None):
+        """Set the labels for stage timers on this thread"""
+        if endpoint is not None:
+            self._local.endpoint = endpoint
+        self._local.mode = mode
+
+    def current(self):
+        """(endpoint, mode) bound on this thread"""
+        local = self._local
+        return getattr(local, 'endpoint', 'none'), getattr(local, 'mode', None) or 'none'
+
+    _labels = current
+
+    def observe_stage(self, stage, seconds):
+        endpoint, mode = self._labels()
+        self.stage_seconds.observe(seconds, endpoint, mode, stage)
+
+    def observe_stages(self, stages):
+        """Record (stage, seconds) pairs of one document"""
+        endpoint, mode = self._labels()
+        observe = self.stage_seconds.observe
+        for stage, seconds in stages:
+            observe(seconds, endpoint, mode, stage)
+
+    def observe_tokens(self, count):
+        endpoint, mode = self._labels()
+        self.input_tokens.observe(count, endpoint, mode)
+
+    def observe_error(self, kind):
+        endpoint, _ = self._labels()
+        self.errors.inc(endpoint, kind)
+
+    def observe_request(self, endpoint, method, status, seconds):
+        self.requests.inc(endpoint, method, str(status))
+        self.request_seconds.observe(seconds, endpoint)
+        if status >= 500:
+            self.errors.inc(endpoint, 'http_5xx')
+        elif status >= 400:
+            self.errors.inc(endpoint, 'http_4xx')
+
+    def add_cache(self, name, stats):
+        """Report a cache through ``stats()`` -> {'hits', 'misses', ...}"""
+        self._caches[name] = stats
+
+    def _cache_stat(self, key):
+        values = {}
+        for name, stats in list(self._caches.items()):
+            data = stats()
+            if key == 'hit_rate' and key not in data:
+                # A revalidated (304) fetch also skips the download and parse
+                hits = data.get('hits', 0) + data.get('revalidated', 0)
+                lookups = hits + data.get('misses', 0)
+                values[(name,)] = round(hits / lookups, 4) if lookups else 0.0
+            else:
+                values[(name,)] = data.get(key, 0)
+        return values
+
+    def add_executor(self, name, stats):
+        """Report a request pool through ``stats()`` -> {'in_flight', 'rejected'}"""
+        self._executors[name] = stats
+
+    def _executor_stat(self, key):
+        return {(name,): stats()[key] for name, stats in list(self._executors.items())}
+
+    def render(self):
+        return self.registry.render()
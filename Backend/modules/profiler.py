@@ -0,0 +1,141 @@
+"""
+Request Profiler - Opt-in profiling of single API requests
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+FORMATS = ('pstats', 'collapsed')
+
+_PROFILE_ID = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+
+def valid_profile_id(profile_id):
+    return bool(profile_id) and bool(_PROFILE_ID.match(profile_id)) and '..' not in profile_id
+
+
+class StackSampler:
+    """
+    Sample one thread's Python stack every ``interval`` seconds and count
+    collapsed stacks ("outer;inner;leaf"), the input format of flamegraph
+    tools. Sampling keeps the overhead flat even for deep call trees.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+
+
+class ProfileSession:
+    """One running profile for the calling thread"""
+
+    def __init__(self, profiler, profile_id, kind):
+        self.profiler = profiler
+        self.profile_id = profile_id
+        self.kind = kind
+        self.started = time.perf_counter()
+        if kind == 'pstats':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(threading.get_ident(), profiler.interval)
+            self._sampler.start()
+
+    def stop(self):
+        """Stop profiling and store the result; returns its path"""
+        if self.kind == 'pstats':
+            self._profile.disable()
+        else:
+            stacks = self._sampler.stop()
+        path = self.profiler.path(self.profile_id, self.kind)
+        tmp = f'{path}.tmp'
+        if self.kind == 'pstats':
+            self._profile.dump_stats(tmp)
+        else:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for stack, count in stacks.most_common():
+                    f.write(f'{stack} {count}\n')
+        os.replace(tmp, path)
+        self.profiler.prune()
+        return path
+
+
+class RequestProfiler:
+    """
+    Stores profiles of single requests under ``directory``, named by
+    profile (request) ID, keeping only the newest ``max_profiles``.
+
+    kind 'pstats':    cProfile output, for pstats / snakeviz
+    kind 'collapsed': sampled stacks, for flamegraph.pl / speedscope
+    """
+
+    def __init__(self, directory, max_profiles=50, interval=0.001):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.interval = interval
+
+    def start(self, profile_id, kind='pstats'):
+        if kind not in FORMATS:
+            raise ValueError(f'Unknown profile format: {kind}')
+        if not valid_profile_id(profile_id):
+            raise ValueError('Invalid profile id')
+        os.makedirs(self.directory, exist_ok=True)
+        return ProfileSession(self, profile_id, kind)
+
+    def path(self, profile_id, kind):
+        return os.path.join(self.directory, f'{profile_id}.{kind}')
+
+    def find(self, profile_id):
+        """(path, kind) of a stored profile, or None"""
+        if not valid_profile_id(profile_id):
+            return None
+        for kind in FORMATS:
+            path = self.path(profile_id, kind)
+            if os.path.exists(path):
+                return path, kind
+        return None
+
+    def prune(self):
+        """Delete the oldest profiles beyond max_profiles"""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.directory)
+                if entry.name.endswith(FORMATS)
+            ]
+        except OSError:
+            return
+        if len(entries) <= self.max_profiles:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_profiles]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
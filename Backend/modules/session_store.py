@@ -0,0 +1,70 @@
+"""
+Session Store - In-memory live-typing sessions with LRU and idle expiry
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class Session:
+    """One client's incremental document; hold ``lock`` while editing it"""
+
+    __slots__ = ('id', 'document', 'lock', 'last_used')
+
+    def __init__(self, session_id, document):
+        self.id = session_id
+        self.document = document
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """
+    Sessions by id, at most ``max_sessions`` (least recently used are
+    dropped first) and none idle for more than ``ttl`` seconds. Sessions
+    live in the memory of one worker process, so clients of a multi-worker
+    deployment need sticky routing; a client that gets 404 recreates its
+    session with the full text.
+    """
+
+    def __init__(self, max_sessions=1000, ttl=1800):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, document):
+        session = Session(uuid.uuid4().hex, document)
+        with self._lock:
+            self._expire(session.last_used)
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id):
+        """Session by id (marked as used), or None if unknown or expired"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self, now):
+        # Oldest first, so stop at the first session still in use
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
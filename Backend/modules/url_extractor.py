@@ -3,14 +3,53 @@ URL Text Extractor - Extract main text content from a webpage URL
 Educational/demo use only. Always respect site terms/robots.txt.
 """
 
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, Tag
+
+try:
+    import lxml  # noqa: F401  optional faster parser backend
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Content containers, in priority order (ties go to the earlier selector)
+CONTENT_SELECTORS = [
+    "article",
+    "main",
+    "div[id*=content]",
+    "div[class*=content]",
+    "div[id*=article]",
+    "div[class*=article]",
+    "div[id*=post]",
+    "div[class*=post]",
+]
+
+# String types get_text() returns for these containers
+TEXT_TYPES = (NavigableString, CData)
 
 class URLTextExtractor:
     """Extract main text from a webpage URL"""
 
-    def __init__(self, timeout=8):
+    def __init__(self, timeout=8, pool_size=16, cache=None,
+                 parser="html.parser", max_html_bytes=5 * 1024 * 1024):
         self.timeout = timeout
+        # "lxml" is used only when installed
+        self.parser = parser if parser != "lxml" or HAS_LXML else "html.parser"
+        # Larger pages are truncated before parsing
+        self.max_html_bytes = max_html_bytes
+        # Optional FetchCache (pages + extracted text, revalidated over HTTP)
+        self.cache = cache
+        # Optional modules.metrics.Metrics for fetch/extract timers
+        self.metrics = None
+        # One pooled session so repeat hosts reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         # Simple headers to look like a browser (still must respect terms)
         self.headers = {
             "User-Agent": (
@@ -23,59 +62,186 @@ class URLTextExtractor:
     def fetch_html(self, url: str) -> str:
         """Download raw HTML for a URL"""
         try:
-            resp = requests.get(url, headers=self.headers, timeout=self.timeout)
+            resp = self.session.get(url, headers=self.headers, timeout=self.timeout)
             if resp.status_code != 200:
                 return ""
             return resp.text
         except Exception:
             return ""
 
+    def fetch_page(self, url: str):
+        """
+        Download a page through the fetch cache.
+
+        Returns (html, text, headers). When the cache can answer - a fresh
+        entry or a 304 Not Modified - text is the cached extracted text and
+        html is empty, so no parsing is needed. Otherwise text is None.
+        """
+        start = time.perf_counter()
+        page = self._fetch_page(url)
+        if self.metrics is not None:
+            self.metrics.observe_stage('fetch', time.perf_counter() - start)
+        return page
+
+    def _fetch_page(self, url):
+        cache = self.cache
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None and entry.is_fresh():
+            text = cache.text(entry)
+            if text is not None:
+                cache.record('hit')
+                return "", text, {}
+
+        headers = self.headers
+        if entry is not None:
+            headers = {**self.headers, **entry.validators()}
+        try:
+            resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            if resp.status_code == 304 and entry is not None:
+                text = cache.text(entry)
+                if text is not None:
+                    cache.refresh(entry, resp.headers)
+                    cache.record('revalidated')
+                    return "", text, resp.headers
+                # Cached text is gone; fetch the page unconditionally
+                resp = self.session.get(url, headers=self.headers, timeout=self.timeout)
+        except Exception:
+            return "", None, {}
+
+        if cache is not None:
+            cache.record('miss')
+        if resp.status_code != 200:
+            return "", None, resp.headers
+        return resp.text, None, resp.headers
+
+    def extract_page(self, url: str, html: str, headers) -> str:
+        """Extract main text from fetched HTML and store it in the cache"""
+        start = time.perf_counter()
+        text = self.extract_main_text(html)
+        if self.metrics is not None:
+            self.metrics.observe_stage('extract', time.perf_counter() - start)
+        if self.cache is not None and html:
+            self.cache.put(url, headers, text)
+        return text
+
     def extract_main_text(self, html: str) -> str:
         """Extract main article-like text from HTML (simple heuristic)"""
+        return self.extract_main_content(html)["text"]
+
+    def extract_main_content(self, html: str) -> dict:
+        """
+        Pick the main content block in one bottom-up pass.
+
+        Word and link-word counts are summed from the leaves up, so each
+        node is visited once however deeply containers nest. The choice is
+        the container (article, main, content/article/post divs) with the
+        most words above 40 - ties go to the earlier selector, then to the
+        earlier node - else the paragraphs of more than 5 words. Only the
+        chosen node's text is materialized.
+
+        Returns text, words, link_density and the matching selector.
+        """
+        empty = {"text": "", "words": 0, "link_density": 0.0, "selector": None}
         if not html:
-            return ""
+            return empty
 
-        soup = BeautifulSoup(html, "html.parser")
+        if len(html) > self.max_html_bytes // 4:
+            data = html.encode("utf-8")
+            if len(data) > self.max_html_bytes:
+                html = data[:self.max_html_bytes].decode("utf-8", errors="ignore")
+
+        soup = BeautifulSoup(html, self.parser)
 
         # Remove script/style/meta tags
         for tag in soup(["script", "style", "noscript", "header", "footer", "nav", "form"]):
             tag.decompose()
 
-        # Try common article/content containers first
-        candidates = []
-
-        selectors = [
-            "article",
-            "main",
-            "div[id*=content]",
-            "div[class*=content]",
-            "div[id*=article]",
-            "div[class*=article]",
-            "div[id*=post]",
-            "div[class*=post]",
-        ]
-
-        for sel in selectors:
-            for el in soup.select(sel):
-                text = el.get_text(separator="\n", strip=True)
-                if text and len(text.split()) > 40:  # at least ~40 words
-                    candidates.append(text)
-
-        # Fallback: all <p> tags
-        if not candidates:
-            paragraphs = [p.get_text(separator=" ", strip=True) for p in soup.find_all("p")]
-            paragraphs = [p for p in paragraphs if len(p.split()) > 5]
-            text = "\n".join(paragraphs)
-            return text.strip()
-
-        # Pick the longest candidate (naive heuristic for "main content")
-        candidates.sort(key=lambda t: len(t.split()), reverse=True)
-        return candidates[0].strip()
+        words = {}
+        link_words = {}
+        best = None
+        best_key = None
+        # Reverse document order visits every child before its parent
+        nodes = list(soup.descendants)
+        for position in range(len(nodes) - 1, -1, -1):
+            node = nodes[position]
+            parent = node.parent
+            if not isinstance(node, Tag):
+                if type(node) in TEXT_TYPES and parent is not None:
+                    count = len(node.split())
+                    if count:
+                        words[id(parent)] = words.get(id(parent), 0) + count
+                continue
+
+            count = words.get(id(node), 0)
+            links = count if node.name == "a" else link_words.get(id(node), 0)
+            if parent is not None:
+                words[id(parent)] = words.get(id(parent), 0) + count
+                if links:
+                    link_words[id(parent)] = link_words.get(id(parent), 0) + links
+            link_words[id(node)] = links
+
+            if count > 40:
+                index = self._selector_index(node)
+                if index is not None:
+                    key = (-count, index, position)
+                    if best_key is None or key < best_key:
+                        best, best_key = node, key
+
+        if best is None:
+            # Fallback: all <p> tags
+            paragraphs = [
+                p.get_text(separator=" ", strip=True) for p in soup.find_all("p")
+                if words.get(id(p), 0) > 5
+            ]
+            text = "\n".join(paragraphs).strip()
+            return {
+                "text": text,
+                "words": len(text.split()),
+                "link_density": 0.0,
+                "selector": "p" if text else None,
+            }
+
+        count = -best_key[0]
+        return {
+            "text": best.get_text(separator="\n", strip=True).strip(),
+            "words": count,
+            "link_density": round(link_words.get(id(best), 0) / count, 3),
+            "selector": CONTENT_SELECTORS[best_key[1]],
+        }
+
+    @staticmethod
+    def _selector_index(node):
+        """Index of the first CONTENT_SELECTORS entry matching a tag"""
+        name = node.name
+        if name == "article":
+            return 0
+        if name == "main":
+            return 1
+        if name != "div":
+            return None
+        attrs = node.attrs
+        node_id = attrs.get("id")
+        if isinstance(node_id, list):
+            node_id = " ".join(node_id)
+        classes = attrs.get("class")
+        if isinstance(classes, list):
+            classes = " ".join(classes)
+        for index, needle in ((2, "content"), (4, "article"), (6, "post")):
+            if node_id and needle in node_id:
+                return index
+            if classes and needle in classes:
+                return index + 1
+        return None
 
     def extract_from_url(self, url: str) -> str:
-        """Full pipeline: URL -> HTML -> main text"""
-        html = self.fetch_html(url)
+        """Full pipeline: URL -> HTML -> main text (cache-aware)"""
+        html, text, headers = self.fetch_page(url)
+        if text is not None:
+            return text
         if not html:
             return ""
-        text = self.extract_main_text(html)
-        return text
+        return self.extract_page(url, html, headers)
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
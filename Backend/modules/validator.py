@@ -24,3 +24,36 @@ class InputValidator:
         if len(texts) == 0:
             return False
         return all(InputValidator.validate_text(t) for t in texts)
+    
+    @staticmethod
+    def validate_edits(edits):
+        """Validate a list of {offset, delete, insert} text edits"""
+        if not isinstance(edits, list) or len(edits) == 0:
+            return False
+        for edit in edits:
+            if not isinstance(edit, dict):
+                return False
+            offset = edit.get('offset')
+            delete = edit.get('delete', 0)
+            insert = edit.get('insert', '')
+            if type(offset) is not int or type(delete) is not int:
+                return False
+            if offset < 0 or delete < 0 or not isinstance(insert, str):
+                return False
+        return True
+    
+    @staticmethod
+    def validate_flag(value):
+        """Validate a JSON boolean option (strings like "false" are rejected)"""
+        return isinstance(value, bool)
+    
+    @staticmethod
+    def validate_view(detail, fields):
+        """Validate detail level and fields projection"""
+        if detail not in ('minimal', 'standard', 'full'):
+            return False
+        if fields is None or isinstance(fields, str):
+            return True
+        if not isinstance(fields, list):
+            return False
+        return all(isinstance(f, str) for f in fields)
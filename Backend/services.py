@@ -0,0 +1,180 @@
+"""
+Service layer - lazily built subsystems shared by the API routes
+"""
+import gc
+import logging
+import threading
+import time
+from contextlib import nullcontext
+
+from modules.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+# Text used to warm every analysis path before serving traffic
+WARM_UP_TEXT = "The battery is not bad, the screen is sick and shipping was fast 🔥 #tech"
+
+
+class Services:
+    """
+    Owns the analyzer and the URL stack for one app.
+
+    Nothing heavy is built at construction: the analyzer (lexicon, WSD
+    index, tokenizer models) is created on first use or by ``warm_up``,
+    and requests/BeautifulSoup are imported only when a URL endpoint is
+    hit. ``startup`` records how long each stage took, in milliseconds.
+    ``metrics`` (None when disabled) is wired into every subsystem.
+    ``cpu_slots`` (a semaphore, set by the ASGI gateway) bounds how many
+    analyses run at once; see ``cpu_slot``.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.startup = {}
+        self.metrics = Metrics() if config['METRICS_ENABLED'] else None
+        self._analyzer = None
+        self._url_extractor = None
+        self._url_batch = None
+        self._profiler = None
+        self._sessions = None
+        self.cpu_slots = None
+        self.preloaded = False
+        self._lock = threading.Lock()
+
+    def _timed(self, stage, build):
+        start = time.perf_counter()
+        value = build()
+        self.startup[stage] = round((time.perf_counter() - start) * 1000, 2)
+        return value
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            with self._lock:
+                if self._analyzer is None:
+                    self._analyzer = self._timed('analyzer_ms', self._build_analyzer)
+        return self._analyzer
+
+    def _build_analyzer(self):
+        from core.analyzer import UniversalWSDAnalyzer
+        analyzer = UniversalWSDAnalyzer(
+            cache_size=self.config['RESULT_CACHE_SIZE'],
+            cache_bytes=self.config['RESULT_CACHE_BYTES'],
+            tokenizer=self.config['TOKENIZER']
+        )
+        if self.metrics is not None:
+            analyzer.metrics = self.metrics
+            if analyzer.cache is not None:
+                self.metrics.add_cache('result', analyzer.cache.stats)
+        return analyzer
+
+    @property
+    def url_extractor(self):
+        if self._url_extractor is None:
+            with self._lock:
+                if self._url_extractor is None:
+                    self._url_extractor = self._timed('url_stack_ms', self._build_url_extractor)
+        return self._url_extractor
+
+    def _build_url_extractor(self):
+        from modules.url_extractor import URLTextExtractor
+        from modules.fetch_cache import FetchCache
+
+        config = self.config
+        fetch_cache = None
+        if config['FETCH_CACHE_DIR']:
+            fetch_cache = FetchCache(
+                config['FETCH_CACHE_DIR'],
+                max_bytes=config['FETCH_CACHE_BYTES'],
+                default_ttl=config['FETCH_CACHE_TTL']
+            )
+        extractor = URLTextExtractor(
+            pool_size=config['URL_FETCH_WORKERS'], cache=fetch_cache,
+            parser=config['HTML_PARSER'], max_html_bytes=config['MAX_HTML_BYTES']
+        )
+        if self.metrics is not None:
+            extractor.metrics = self.metrics
+            if fetch_cache is not None:
+                self.metrics.add_cache('fetch', fetch_cache.stats)
+        return extractor
+
+    @property
+    def url_batch(self):
+        """URLBatchAnalyzer shared by all multi-URL requests"""
+        if self._url_batch is None:
+            extractor = self.url_extractor
+            with self._lock:
+                if self._url_batch is None:
+                    from modules.url_batch import URLBatchAnalyzer
+                    self._url_batch = URLBatchAnalyzer(
+                        extractor,
+                        max_workers=self.config['URL_FETCH_WORKERS'],
+                        per_host=self.config['URL_FETCH_PER_HOST']
+                    )
+        return self._url_batch
+
+    @property
+    def profiler(self):
+        """RequestProfiler, or None when profiling is disabled"""
+        if self._profiler is None and self.config['PROFILING_ENABLED']:
+            from modules.profiler import RequestProfiler
+            self._profiler = RequestProfiler(
+                self.config['PROFILE_DIR'], max_profiles=self.config['PROFILE_MAX_FILES']
+            )
+        return self._profiler
+
+    @property
+    def sessions(self):
+        """SessionStore of live-typing sessions"""
+        if self._sessions is None:
+            with self._lock:
+                if self._sessions is None:
+                    from modules.session_store import SessionStore
+                    self._sessions = SessionStore(
+                        max_sessions=self.config['SESSION_MAX'],
+                        ttl=self.config['SESSION_TTL']
+                    )
+        return self._sessions
+
+    def open_session(self, text=''):
+        """Start a live-typing session analyzing ``text`` incrementally"""
+        from core.incremental import IncrementalDocument
+        with self.cpu_slot():
+            document = IncrementalDocument(self.analyzer, text)
+        return self.sessions.create(document)
+
+    def cpu_slot(self):
+        """Context manager holding one analysis slot (no-op when unbounded)"""
+        return self.cpu_slots if self.cpu_slots is not None else nullcontext()
+
+    def warm_up(self, url_stack=False):
+        """
+        Build the analyzer and run every analysis mode once, so tokenizer
+        models, indexes and lazy tables are loaded before the first
+        request. Call before the worker accepts traffic.
+        """
+        start = time.perf_counter()
+        self.analyzer.warm_up(WARM_UP_TEXT)
+        if url_stack:
+            self.url_extractor.extract_main_text(
+                "<article><p>" + WARM_UP_TEXT + "</p></article>"
+            )
+        self.startup['warm_up_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"Warm-up done: {self.startup}")
+        return self.startup
+
+    def preload(self, url_stack=False):
+        """
+        Warm up and freeze the analyzer in a parent process before workers
+        are forked (gunicorn preload_app). After gc.freeze() the collector
+        in the workers never writes to the objects built so far, so their
+        pages stay shared copy-on-write instead of being copied per worker.
+        """
+        self.warm_up(url_stack)
+        start = time.perf_counter()
+        self.analyzer.freeze()
+        gc.collect()
+        gc.freeze()
+        self.preloaded = True
+        self.startup['preload_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return self.startup
@@ -0,0 +1,172 @@
+"""
+Memory benchmark: per-worker memory with and without shared tables
+
+    python benchmarks/bench_memory.py                  # 4 workers, all strategies
+    python benchmarks/bench_memory.py --workers 8 --tokenizer fast
+    python benchmarks/bench_memory.py --output memory.json
+
+Forks --workers processes the way gunicorn does and has each analyze the
+tweets and reviews corpora, then reads /proc/<pid>/smaps_rollup while
+all of them are alive. Strategies:
+
+    fresh     each worker imports and builds its own analyzer (no preload)
+    preload   analyzer built and warmed up in the parent before fork
+    frozen    preload + UniversalWSDAnalyzer.freeze() + gc.freeze()
+              (what gunicorn.conf.py does with PRELOAD_APP=1)
+
+USS is the memory only that worker holds (what one more worker costs);
+PSS splits shared pages between the processes using them. Linux only.
+"""
+import argparse
+import gc
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'Backend'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+STRATEGIES = ['fresh', 'preload', 'frozen']
+
+
+def smaps(pid):
+    """Memory of one process in KiB: rss, pss, uss, shared"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss_kb': values.get('Rss', 0),
+        'pss_kb': values.get('Pss', 0),
+        'uss_kb': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+        'shared_kb': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0),
+    }
+
+
+def build_analyzer(tokenizer):
+    from core.analyzer import UniversalWSDAnalyzer
+    from services import WARM_UP_TEXT
+
+    analyzer = UniversalWSDAnalyzer(cache_size=0, tokenizer=tokenizer)
+    analyzer.warm_up(WARM_UP_TEXT)
+    return analyzer
+
+
+def workload(analyzer, texts):
+    for mode in ('general', 'product', 'social'):
+        for text in texts:
+            analyzer.analyze(text, mode=mode)
+    # Collections in a long-running worker touch every tracked object
+    gc.collect()
+
+
+def measure(strategy, workers, tokenizer):
+    """Fork the workers for one strategy; returns per-worker and parent memory"""
+    import corpora
+
+    texts = corpora.load('tweets') + corpora.load('reviews')
+    analyzer = None
+    if strategy != 'fresh':
+        analyzer = build_analyzer(tokenizer)
+        if strategy == 'frozen':
+            analyzer.freeze()
+            gc.collect()
+            gc.freeze()
+
+    pids = []
+    ready_r, ready_w = os.pipe()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            worker = analyzer if analyzer is not None else build_analyzer(tokenizer)
+            workload(worker, texts)
+            os.write(ready_w, b'.')
+            signal.pause()
+            os._exit(0)
+        pids.append(pid)
+    os.close(ready_w)
+
+    for _ in range(workers):
+        os.read(ready_r, 1)
+    time.sleep(0.2)
+    try:
+        return {'parent': smaps(os.getpid()), 'workers': [smaps(pid) for pid in pids]}
+    finally:
+        for pid in pids:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+
+
+def summarize(result):
+    workers = result['workers']
+    n = len(workers)
+    return {
+        'uss_mb': round(sum(w['uss_kb'] for w in workers) / n / 1024, 1),
+        'pss_mb': round(sum(w['pss_kb'] for w in workers) / n / 1024, 1),
+        'rss_mb': round(sum(w['rss_kb'] for w in workers) / n / 1024, 1),
+        'total_pss_mb': round((sum(w['pss_kb'] for w in workers)
+                               + result['parent']['pss_kb']) / 1024, 1),
+    }
+
+
+def run(workers=4, tokenizer='nltk'):
+    """Measure every strategy in a fresh interpreter; returns the report"""
+    report = {'meta': {'workers': workers, 'tokenizer': tokenizer}, 'strategies': {}}
+    for strategy in STRATEGIES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--strategy', strategy,
+             '--workers', str(workers), '--tokenizer', tokenizer],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output)
+        report['strategies'][strategy] = {**summarize(result), **result}
+    return report
+
+
+def print_report(report):
+    strategies = report['strategies']
+    base = strategies['fresh']['uss_mb']
+    print(f"{report['meta']['workers']} workers, tokenizer={report['meta']['tokenizer']}")
+    print(f"  {'strategy':10s} {'USS/worker':>12s} {'PSS/worker':>12s} {'RSS/worker':>12s} "
+          f"{'total PSS':>11s} {'saved/worker':>13s}")
+    for name, stats in strategies.items():
+        print(f"  {name:10s} {stats['uss_mb']:10.1f}MB {stats['pss_mb']:10.1f}MB "
+              f"{stats['rss_mb']:10.1f}MB {stats['total_pss_mb']:9.1f}MB "
+              f"{base - stats['uss_mb']:11.1f}MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--strategy', choices=STRATEGIES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists('/proc/self/smaps_rollup') or not hasattr(os, 'fork'):
+        print("bench_memory needs Linux (/proc/<pid>/smaps_rollup and fork)")
+        return 1
+
+    if args.strategy:
+        # Child run for one strategy
+        print(json.dumps(measure(args.strategy, args.workers, args.tokenizer)))
+        return 0
+
+    report = run(args.workers, args.tokenizer)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Pipeline benchmark: per-stage latency and throughput over benchmark corpora
+
+    python benchmarks/bench_pipeline.py                       # all corpora
+    python benchmarks/bench_pipeline.py --corpus tweets --corpus reviews
+    python benchmarks/bench_pipeline.py --output results.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+
+Every document is pushed through the analyzer's stages one by one, each
+timed separately: tokenize, prepare (normalize + lexicon lookup),
+disambiguate, emoji scan, score, wsd output, word breakdown, and the
+product and social extras. Whole analyze() calls are timed per mode with
+the result cache disabled. With --baseline, the p50 of every stage is
+compared with the stored run and the exit status is 1 if any stage is
+slower by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'Backend'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import corpora
+from core.analyzer import UniversalWSDAnalyzer, Document
+
+STAGES = [
+    'tokenize', 'prepare', 'disambiguate', 'emoji_scan', 'score',
+    'wsd_output', 'word_breakdown', 'product_extras', 'social_extras',
+]
+MODES = ['general', 'product', 'social']
+
+# Stages faster than this (p50, ms) are too noisy to gate on
+MIN_GATED_MS = 0.005
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile of pre-sorted values (q in 0..100)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100.0
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = position - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+def summarize(samples, documents):
+    """Latency percentiles (ms) and throughput for one stage"""
+    values = sorted(samples)
+    total = sum(values)
+    return {
+        'mean_ms': round(total / len(values) * 1000, 4),
+        'p50_ms': round(percentile(values, 50) * 1000, 4),
+        'p95_ms': round(percentile(values, 95) * 1000, 4),
+        'p99_ms': round(percentile(values, 99) * 1000, 4),
+        'total_s': round(total, 4),
+        'docs_per_s': round(documents / total, 1) if total else None,
+    }
+
+
+def time_stages(analyzer, text, samples):
+    """Run one document through every stage, appending per-stage seconds"""
+    clock = time.perf_counter
+
+    start = clock()
+    raw = analyzer.tokenizer.tokenize(text)
+    samples['tokenize'].append(clock() - start)
+
+    start = clock()
+    tokens = analyzer.scorer.prepare_tokens(raw)
+    samples['prepare'].append(clock() - start)
+
+    start = clock()
+    senses = analyzer.wsd.disambiguate(tokens)
+    samples['disambiguate'].append(clock() - start)
+
+    start = clock()
+    emojis = analyzer.lexicon.get_emoji_scanner().scan(text)
+    samples['emoji_scan'].append(clock() - start)
+
+    start = clock()
+    contributions = analyzer.scorer.token_contributions(tokens, senses)
+    score = analyzer.scorer.score_contributions(contributions, emojis)
+    analyzer._calculate_confidence(score, senses)
+    samples['score'].append(clock() - start)
+
+    start = clock()
+    senses.to_dict()
+    samples['wsd_output'].append(clock() - start)
+
+    start = clock()
+    analyzer._breakdown_words(tokens)
+    samples['word_breakdown'].append(clock() - start)
+
+    doc = Document(tokens, senses, emojis, contributions)
+    start = clock()
+    analyzer._extract_aspects(doc, None)
+    analyzer._get_recommendation(score)
+    samples['product_extras'].append(clock() - start)
+
+    start = clock()
+    hashtags = analyzer._extract_hashtags(text)
+    analyzer._calculate_engagement({'score': score}, hashtags, text)
+    analyzer._analyze_emojis(emojis)
+    analyzer._count_emojis(emojis)
+    samples['social_extras'].append(clock() - start)
+
+    return len(raw)
+
+
+def bench_corpus(analyzer, texts, repeat):
+    samples = {stage: [] for stage in STAGES}
+    end_to_end = {mode: [] for mode in MODES}
+    tokens = 0
+
+    # Warm caches and lazy tables outside the measurement
+    time_stages(analyzer, texts[0], {stage: [] for stage in STAGES})
+
+    for _ in range(repeat):
+        tokens = 0
+        for text in texts:
+            tokens += time_stages(analyzer, text, samples)
+        for mode in MODES:
+            for text in texts:
+                start = time.perf_counter()
+                analyzer.analyze(text, mode=mode)
+                end_to_end[mode].append(time.perf_counter() - start)
+
+    documents = len(texts) * repeat
+    stages = {stage: summarize(values, documents) for stage, values in samples.items()}
+    modes = {mode: summarize(values, documents) for mode, values in end_to_end.items()}
+    pipeline_s = sum(stage['total_s'] for stage in stages.values())
+    return {
+        'documents': len(texts),
+        'tokens': tokens,
+        'repeat': repeat,
+        'tokens_per_s': round(tokens * repeat / pipeline_s, 1) if pipeline_s else None,
+        'stages': stages,
+        'end_to_end': modes,
+    }
+
+
+def run(corpus_names, repeat=3, scale=1.0, tokenizer='nltk'):
+    """Benchmark the named corpora; returns the JSON-serializable report"""
+    analyzer = UniversalWSDAnalyzer(cache_size=0, tokenizer=tokenizer)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tokenizer': tokenizer,
+            'scale': scale,
+        },
+        'corpora': {},
+    }
+    for name in corpus_names:
+        texts = corpora.load(name, scale)
+        # Long documents are few and slow; one pass is enough
+        passes = 1 if name == 'articles' else repeat
+        report['corpora'][name] = bench_corpus(analyzer, texts, passes)
+    analyzer.close()
+    return report
+
+
+# Report settings that must match the baseline for latencies to be comparable
+COMPARABLE_META = ('tokenizer', 'scale')
+
+
+def compare(report, baseline, threshold=0.2):
+    """
+    Compare p50 latencies with a baseline report.
+
+    Returns (rows, regressions) where each row is
+    (corpus, stage, baseline_ms, current_ms, ratio). Raises ValueError when
+    the two reports ran different workloads (tokenizer or corpus scale).
+    """
+    meta, baseline_meta = report.get('meta', {}), baseline.get('meta', {})
+    for key in COMPARABLE_META:
+        if meta.get(key) != baseline_meta.get(key):
+            raise ValueError(
+                f"baseline was run with {key}={baseline_meta.get(key)!r}, "
+                f"this report with {key}={meta.get(key)!r}"
+            )
+    rows, regressions = [], []
+    for name, current in report['corpora'].items():
+        previous = baseline.get('corpora', {}).get(name)
+        if previous is None:
+            continue
+        groups = [('', current['stages'], previous.get('stages', {})),
+                  ('analyze:', current['end_to_end'], previous.get('end_to_end', {}))]
+        for prefix, now, before in groups:
+            for stage, stats in now.items():
+                if stage not in before:
+                    continue
+                old_ms = before[stage]['p50_ms']
+                new_ms = stats['p50_ms']
+                ratio = new_ms / old_ms if old_ms else 1.0
+                row = (name, prefix + stage, old_ms, new_ms, ratio)
+                rows.append(row)
+                if old_ms >= MIN_GATED_MS and ratio > 1.0 + threshold:
+                    regressions.append(row)
+    return rows, regressions
+
+
+def print_report(report):
+    for name, result in report['corpora'].items():
+        print(f"\n{name}: {result['documents']} docs x {result['repeat']}, "
+              f"{result['tokens']} tokens, {result['tokens_per_s']} tokens/s")
+        print(f"  {'stage':18s} {'p50 ms':>10s} {'p95 ms':>10s} {'p99 ms':>10s} {'docs/s':>12s}")
+        rows = list(result['stages'].items())
+        rows += [(f'analyze:{mode}', stats) for mode, stats in result['end_to_end'].items()]
+        for stage, stats in rows:
+            print(f"  {stage:18s} {stats['p50_ms']:10.4f} {stats['p95_ms']:10.4f} "
+                  f"{stats['p99_ms']:10.4f} {stats['docs_per_s'] or 0:12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', action='append', choices=corpora.available(),
+                        help='corpus to run (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply synthetic corpus sizes')
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--baseline', help='compare with this JSON report')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed p50 slowdown vs baseline (0.2 = 20%%)')
+    parser.add_argument('--save-baseline', help='write the JSON report as the new baseline')
+    args = parser.parse_args(argv)
+
+    report = run(args.corpus or corpora.available(), args.repeat, args.scale, args.tokenizer)
+    print_report(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        try:
+            rows, regressions = compare(report, baseline, args.threshold)
+        except ValueError as e:
+            print(f"\nCannot compare with baseline {args.baseline}: {e}")
+            return 2
+        print(f"\nvs baseline {args.baseline} (threshold {args.threshold:.0%})")
+        for name, stage, old_ms, new_ms, ratio in rows:
+            flag = '  REGRESSION' if (name, stage, old_ms, new_ms, ratio) in regressions else ''
+            print(f"  {name:12s} {stage:22s} {old_ms:10.4f} -> {new_ms:10.4f} ms "
+                  f"({ratio:5.2f}x){flag}")
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
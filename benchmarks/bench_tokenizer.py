@@ -0,0 +1,48 @@
+"""
+Tokenizer benchmark: NLTK word_tokenize vs the fast regex tokenizer
+
+    python benchmarks/bench_tokenizer.py [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'Backend'))
+
+from core.tokenizer import get_tokenizer
+
+SHORT = [
+    "The movie was sick bro 🔥🔥 #mustwatch @netflix",
+    "I don't like the battery, but the screen is great.",
+    "Can't believe how fast shipping was!! 5 stars :)",
+    "Customer service was rude... won't be back 😡",
+    "Love love LOVE this jacket!!! Fits perfectly <3",
+]
+LONG = " ".join(SHORT * 40)
+
+
+def bench(tokenizer, texts, repeat):
+    tokenizer.tokenize(texts[0])  # load models / warm caches
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            tokenizer.tokenize(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    for label, texts, repeat in (('short post', SHORT, args.repeat),
+                                 ('long text', [LONG], max(1, args.repeat // 10))):
+        times = {name: bench(get_tokenizer(name), texts, repeat) for name in ('nltk', 'fast')}
+        print(f"{label:10s}  nltk {times['nltk'] * 1e6:9.1f} us   "
+              f"fast {times['fast'] * 1e6:9.1f} us   "
+              f"speedup {times['nltk'] / times['fast']:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
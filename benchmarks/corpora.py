@@ -0,0 +1,126 @@
+"""
+Benchmark corpora - deterministic synthetic texts plus recorded samples
+"""
+import json
+import random
+from pathlib import Path
+
+RECORDED_DIR = Path(__file__).parent / 'corpora'
+
+POSITIVE = ['great', 'amazing', 'love', 'excellent', 'awesome', 'perfect', 'happy', 'good']
+NEGATIVE = ['terrible', 'awful', 'hate', 'poor', 'broken', 'disappointing', 'worst', 'bad']
+AMBIGUOUS = ['sick', 'fire', 'cool', 'bad']
+INTENSIFIERS = ['very', 'really', 'extremely', 'so', 'absolutely']
+NEGATIONS = ['not', 'never', "don't", 'hardly']
+ASPECTS = ['battery', 'screen', 'price', 'shipping', 'quality', 'service', 'design', 'fit']
+FILLER = ['the', 'this', 'it', 'was', 'is', 'and', 'with', 'for', 'my', 'a', 'of', 'after',
+          'phone', 'movie', 'day', 'week', 'they', 'we', 'just', 'really', 'weather', 'beat']
+EMOJIS = ['😍', '🔥', '😡', '😂', '👍', '👎', '❤️', '😢', '🎉', '💯']
+HASHTAGS = ['#tech', '#music', '#fail', '#love', '#review', '#mustwatch']
+
+
+def _sentence(rng, words):
+    parts = []
+    for _ in range(words):
+        roll = rng.random()
+        if roll < 0.12:
+            parts.append(rng.choice(POSITIVE))
+        elif roll < 0.22:
+            parts.append(rng.choice(NEGATIVE))
+        elif roll < 0.27:
+            parts.append(rng.choice(AMBIGUOUS))
+        elif roll < 0.32:
+            parts.append(rng.choice(INTENSIFIERS))
+        elif roll < 0.36:
+            parts.append(rng.choice(NEGATIONS))
+        elif roll < 0.44:
+            parts.append(rng.choice(ASPECTS))
+        else:
+            parts.append(rng.choice(FILLER))
+    return ' '.join(parts).capitalize() + rng.choice(['.', '!', '?', '...'])
+
+
+def tweets(n=500, seed=1):
+    """Short social posts (10-25 words) with hashtags and a few emojis"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        text = _sentence(rng, rng.randint(10, 25))
+        text += ' ' + ' '.join(rng.sample(HASHTAGS, rng.randint(0, 2)))
+        text += ' ' + ''.join(rng.choice(EMOJIS) for _ in range(rng.randint(0, 2)))
+        texts.append(text.strip())
+    return texts
+
+
+def reviews(n=200, seed=2):
+    """Medium product reviews (3-8 sentences)"""
+    rng = random.Random(seed)
+    return [
+        ' '.join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(3, 8)))
+        for _ in range(n)
+    ]
+
+
+def articles(n=3, words=10000, seed=3):
+    """Long articles of about ``words`` words"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        sentences, count = [], 0
+        while count < words:
+            length = rng.randint(12, 30)
+            sentences.append(_sentence(rng, length))
+            count += length
+        texts.append(' '.join(sentences))
+    return texts
+
+
+def emoji_heavy(n=300, seed=4):
+    """Short posts where emojis (incl. ZWJ and skin-tone sequences) dominate"""
+    rng = random.Random(seed)
+    extra = ['👍🏽', '👨‍👩‍👧', '❤️‍🔥', '🙌🏻']
+    texts = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(6, 16)):
+            if rng.random() < 0.55:
+                parts.append(''.join(rng.choice(EMOJIS + extra) for _ in range(rng.randint(1, 3))))
+            else:
+                parts.append(rng.choice(POSITIVE + NEGATIVE + FILLER))
+        texts.append(' '.join(parts))
+    return texts
+
+
+def recorded(name):
+    """Texts from corpora/<name>.jsonl (one JSON string or {"text": ...} per line)"""
+    texts = []
+    with open(RECORDED_DIR / f'{name}.jsonl', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                item = json.loads(line)
+                texts.append(item['text'] if isinstance(item, dict) else item)
+    return texts
+
+
+SYNTHETIC = {
+    'tweets': tweets,
+    'reviews': reviews,
+    'articles': articles,
+    'emoji_heavy': emoji_heavy,
+}
+
+
+def load(name, scale=1.0):
+    """Corpus by name: a synthetic generator or a recorded file"""
+    if name in SYNTHETIC:
+        generator = SYNTHETIC[name]
+        if scale != 1.0:
+            default = generator.__defaults__[0]
+            return generator(max(1, int(default * scale)))
+        return generator()
+    return recorded(name)
+
+
+def available():
+    return list(SYNTHETIC) + sorted(p.stem for p in RECORDED_DIR.glob('*.jsonl'))
@@ -110,3 +110,225 @@ def test_long_text(analyzer):
     long_text = "This is a great product! " * 10
     result = analyzer.analyze(long_text)
     assert result.get('success') == True
+
+
+def test_prepared_tokens(analyzer):
+    """Test tokens are normalized once with lexicon and modifier flags"""
+    tokens = analyzer.scorer.prepare_tokens(["Not", "really", "GOOD!"])
+    assert [t.norm for t in tokens] == ['not', 'really', 'good']
+    assert tokens[0].is_negator
+    assert tokens[1].intensity == 1.2
+    assert tokens[2].score == 1.0
+    assert analyzer.scorer.score_tokens(tokens, {}) == analyzer.scorer.score_tokens(
+        ["Not", "really", "GOOD!"], {}
+    )
+
+
+def test_negator_lookback_uses_normalized_tokens(analyzer):
+    """Test negators with punctuation attached and whole contractions negate"""
+    scorer = analyzer.scorer
+    assert scorer.score_tokens(['good'], {}) == 1.0
+    # "not," and '"not' negate once their punctuation is stripped
+    assert scorer.score_tokens(['not,', 'good'], {}) == -1.0
+    assert scorer.score_tokens(['"Not', 'good'], {}) == -1.0
+    # Contractions kept whole by the fast tokenizer
+    for negator in ("don't", "isn't", "wasn't", "can't", 'cannot'):
+        assert scorer.score_tokens([negator, 'good'], {}) == -1.0
+    fast = UniversalWSDAnalyzer(tokenizer='fast')
+    assert fast.analyze("It isn't good")['score'] < 0
+
+
+def test_wsd_sense_selection(analyzer):
+    """Test context clues pick the sense from the sliding window"""
+    senses = analyzer.wsd.disambiguate("I am feeling sick".split())
+    assert senses[3]['sense'] == 'health'
+    senses = analyzer.wsd.disambiguate("the movie is sick bro".split())
+    assert senses[3]['sense'] == 'positive'
+    assert senses[3]['confidence'] >= 0.55
+
+
+def test_wsd_compiled_index_extension(analyzer):
+    """Test new senses are picked up after recompiling the clue index"""
+    analyzer.wsd.sense_inventory['light'] = ['weight', 'lamp']
+    analyzer.wsd.context_clues['light'] = {'lamp': ['switch', 'bulb']}
+    analyzer.wsd.compile_index()
+    senses = analyzer.wsd.disambiguate("turn the light switch".split())
+    assert senses[2]['sense'] == 'lamp'
+
+
+def test_sparse_wsd_output(analyzer):
+    """Test only ambiguous words are kept unless the full view is requested"""
+    full = analyzer.analyze("The movie is sick bro")
+    assert len(full['wsd_analysis']) == 5
+    assert full['wsd_analysis'][3]['context'][0] == 'The'
+
+    result = analyzer.analyze("The movie is sick bro", ambiguous_only=True)
+    assert list(result['wsd_analysis']) == [3]
+    assert result['wsd_analysis'][3]['sense'] == 'positive'
+    assert result['score'] == full['score']
+
+
+def test_analyze_many_serial(analyzer):
+    """Test batch analysis keeps order and isolates failing items"""
+    results = analyzer.analyze_many(["This is amazing!", None, "This is terrible!"], workers=1)
+    assert [r.get('sentiment') for r in results] == ['POSITIVE', None, 'NEGATIVE']
+    assert results[1]['success'] == False
+
+
+def test_analyze_many_parallel(analyzer):
+    """Test process-pool batch analysis matches in-process results"""
+    texts = ["This is amazing!", "This is terrible!", "", "The weather is cloudy."] * 20
+    try:
+        results = analyzer.analyze_many(texts, workers=2, chunk_size=7)
+    finally:
+        analyzer.close()
+    assert results == [analyzer.analyze_one(t) for t in texts]
+
+
+def test_result_cache(analyzer):
+    """Test repeated texts hit the cache and get independent copies"""
+    first = analyzer.analyze("The movie is sick bro")
+    first['source_url'] = 'http://example.com'
+    second = analyzer.analyze("The movie is sick bro")
+    assert 'source_url' not in second
+    assert second['score'] == first['score']
+    stats = analyzer.cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+    analyzer.lexicon.mark_updated()
+    analyzer.analyze("The movie is sick bro")
+    assert analyzer.cache.stats()['misses'] == 2
+
+
+def test_result_cache_eviction():
+    """Test the LRU bound evicts the least recently used entry"""
+    analyzer = UniversalWSDAnalyzer(cache_size=2)
+    for text in ("Good one", "Bad one", "Good one", "Great one"):
+        analyzer.analyze(text)
+    assert analyzer.cache.stats()['evictions'] == 1
+    analyzer.analyze("Good one")
+    assert analyzer.cache.stats()['hits'] == 2
+
+
+def test_emoji_scanner_single_pass(analyzer):
+    """Test emoji occurrences, variation selectors and grapheme clusters"""
+    scanner = analyzer.lexicon.get_emoji_scanner()
+    text = "🔥🔥 love ❤ and ❤️ 👍🏽 🤦‍♂️"
+    matches = scanner.scan(text)
+    assert [m[2] for m in matches] == ['🔥', '🔥', '❤️', '❤️', '👍', '🤦']
+    assert text[matches[4][0]:matches[4][1]] == '👍🏽'
+    assert scanner.counts(text)['🔥'] == 2
+
+
+def test_emojis_feed_score(analyzer):
+    """Test emoji sentiment reaches the overall score"""
+    result = analyzer.analyze("Just landed 🔥🔥💯", mode='social')
+    assert result['sentiment'] == 'POSITIVE'
+    assert result['emoji_counts'] == {'🔥': 2, '💯': 1}
+    assert result['emoji_analysis'] == {'🔥': 1.5, '💯': 1.5}
+
+
+def test_aspect_sentiment(analyzer):
+    """Test aspects carry the sentiment of their surrounding words"""
+    result = analyzer.analyze(
+        "The build quality is amazing. Shipping was terrible and very slow.",
+        mode='product'
+    )
+    aspects = result['aspects']
+    assert aspects['quality']['sentiment'] == 'POSITIVE'
+    assert aspects['shipping']['sentiment'] == 'NEGATIVE'
+    assert aspects['quality']['mentions'] == 1
+
+
+def test_aspect_single_word_label(analyzer):
+    """Test one plain sentiment word next to an aspect labels it"""
+    good = analyzer.analyze("The battery is good.", mode='product', category='electronics')
+    assert good['aspects']['battery'] == {'mentions': 1, 'score': 1.0, 'sentiment': 'POSITIVE'}
+    poor = analyzer.analyze("The battery is poor.", mode='product', category='electronics')
+    assert poor['aspects']['battery'] == {'mentions': 1, 'score': -1.0, 'sentiment': 'NEGATIVE'}
+    plain = analyzer.analyze("The battery is here.", mode='product', category='electronics')
+    assert plain['aspects']['battery']['sentiment'] == 'NEUTRAL'
+
+
+def test_aspect_category(analyzer):
+    """Test category-specific aspect terms and multi-word terms"""
+    text = "Battery life is awesome but the price is awful"
+    general = analyzer.analyze(text, mode='product')
+    electronics = analyzer.analyze(text, mode='product', category='electronics')
+    assert 'battery' not in general['aspects']
+    assert electronics['aspects']['battery']['sentiment'] == 'POSITIVE'
+    assert electronics['aspects']['price']['sentiment'] == 'NEGATIVE'
+
+    # Unknown categories fall back to 'general' without an index of their own
+    unknown = analyzer.analyze(text, mode='product', category='no-such-category')
+    assert unknown['aspects'] == general['aspects']
+    assert 'no-such-category' not in analyzer.aspect_index._indexes
+
+
+def test_vectorized_scoring_matches_scorer(analyzer):
+    """Test the NumPy batch engine matches per-text scoring"""
+    texts = [
+        "This song is fire bro!", "I am feeling sick", "not very good at all",
+        "The house is on fire", "really really terrible", "", "so cool dude 🔥",
+        "I don't hate it", "The weather is cloudy.", "never bad, always great"
+    ]
+    batch = analyzer.score_many(texts)
+    for text, result in zip(texts, batch):
+        single = analyzer.analyze(text)
+        assert result.get('success') == single.get('success')
+        if single.get('success'):
+            assert abs(result['score'] - single['score']) < 1e-9
+            assert result['sentiment'] == single['sentiment']
+
+
+def test_long_document_mode(analyzer):
+    """Test chunked analysis matches the whole-text result and caps detail"""
+    text = " ".join([
+        "The movie was sick and the soundtrack is fire.",
+        "I was not happy with the ending though.",
+        "The house nearly caught fire during the storm!",
+        "Really great acting, very bad pacing."
+    ] * 40)
+    full = analyzer.analyze(text)
+    result = analyzer.analyze_long_document(text, top_n=3, max_senses=5, chunk_chars=300)
+    assert result['success'] == True
+    assert result['long_document']['chunks'] > 1
+    assert result['score'] == full['score']
+    assert result['confidence'] == full['confidence']
+    assert len(result['word_breakdown']) == 3
+    assert len(result['wsd_analysis']) == 5
+
+def test_detail_levels(analyzer):
+    """Test minimal/standard/full projections and fields"""
+    text = "The movie is sick bro"
+    full = analyzer.analyze(text)
+    minimal = analyzer.analyze(text, detail='minimal')
+    standard = analyzer.analyze(text, detail='standard')
+    assert set(minimal) == {'success', 'score', 'sentiment', 'confidence', 'intensity'}
+    assert minimal['score'] == full['score']
+    assert 'word_breakdown' in standard
+    assert list(standard['wsd_analysis']) == [3]
+    assert 'context' not in standard['wsd_analysis'][3]
+    assert analyzer.analyze(text, fields=['score']) == {'success': True, 'score': full['score']}
+    assert analyzer.analyze(text, detail='huge')['success'] is False
+
+
+def test_frozen_tables(analyzer):
+    """Test frozen tables are read-only and give identical results"""
+    frozen = UniversalWSDAnalyzer(cache_size=0)
+    frozen.freeze()
+    texts = ["This song is fire bro!", "I am feeling sick", "The battery is not great",
+             "so cool dude 🔥 #music", "The house is on fire"] * 8
+    for mode in ('general', 'product', 'social'):
+        expected = [analyzer.analyze(text, mode=mode) for text in texts]
+        assert [frozen.analyze(text, mode=mode) for text in texts] == expected
+        # Forked pool workers inherit the frozen analyzer
+        assert frozen.analyze_many(texts, mode=mode, workers=2) == expected
+    frozen.close()
+
+    with pytest.raises(TypeError):
+        frozen.wsd.sense_inventory['bank'] = ('financial',)
+    with pytest.raises(TypeError):
+        frozen.lexicon.positive_words['meh'] = 0.1
+    with pytest.raises(TypeError):
+        frozen.scorer.wsd_overrides['sick']['health'] = 0.0
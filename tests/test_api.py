@@ -45,6 +45,14 @@ def test_analyze_product_endpoint(client):
     data = json.loads(response.data)
     assert data['success'] == True
 
+def test_unknown_product_category(client):
+    """Test an unknown product category is rejected"""
+    response = client.post('/api/analyze-product',
+        json={'text': 'Great quality!', 'category': 'spaceships'},
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
 def test_analyze_social_endpoint(client):
     """Test social analysis"""
     response = client.post('/api/analyze-social',
@@ -85,3 +93,133 @@ def test_invalid_mode(client):
         content_type='application/json'
     )
     assert response.status_code == 200
+
+def test_analyze_ambiguous_only(client):
+    """Test the option to return only disambiguated words"""
+    response = client.post('/api/analyze',
+        json={'text': 'The movie is sick bro', 'ambiguous_only': True},
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert list(data['data']['wsd_analysis']) == ['3']
+
+    # Only JSON booleans are accepted
+    response = client.post('/api/analyze',
+        json={'text': 'The movie is sick bro', 'ambiguous_only': 'false'},
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+def test_analyze_detail(client):
+    """Test detail levels and field projection"""
+    response = client.post('/api/analyze',
+        json={'text': 'Great product', 'fields': ['score', 'sentiment']},
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert set(data['data']) == {'success', 'score', 'sentiment'}
+
+    response = client.post('/api/analyze',
+        json={'text': 'Great product', 'detail': 'everything'},
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+def test_batch_size_limit(client):
+    """Test batches above the configured maximum are rejected"""
+    app.config['MAX_BATCH_SIZE'] = 2
+    try:
+        response = client.post('/api/analyze-batch',
+            json={'texts': ['Good!', 'Bad!', 'OK']},
+            content_type='application/json'
+        )
+    finally:
+        app.config['MAX_BATCH_SIZE'] = 10000
+    assert response.status_code == 413
+
+def test_stream_endpoint(client):
+    """Test NDJSON streaming with per-line results and a summary trailer"""
+    body = '"This is amazing!"\n{"id": 7, "text": "This is terrible!"}\nnot json\n\n'
+    response = client.post('/api/analyze-stream', data=body,
+        content_type='application/x-ndjson'
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert len(lines) == 4
+    assert lines[0]['sentiment'] == 'POSITIVE'
+    assert lines[1]['id'] == 7 and lines[1]['sentiment'] == 'NEGATIVE'
+    assert lines[2]['success'] == False
+    assert lines[3]['total'] == 3
+    assert lines[3]['summary']['positive'] == 1
+    assert lines[3]['summary']['negative'] == 1
+
+def test_metrics_endpoint(client):
+    """Test Prometheus metrics for requests, stages and caches"""
+    client.post('/api/analyze-social', json={'text': 'The beat is fire 🔥 #music'})
+    client.post('/api/analyze', json={'text': ''})
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.data.decode('utf-8')
+    assert 'wsd_requests_total{endpoint="api.analyze_social",method="POST",status="200"}' in text
+    assert 'wsd_errors_total{endpoint="api.analyze_general",kind="http_4xx"}' in text
+    for stage in ('tokenize', 'disambiguate', 'score', 'social_extras', 'json_encode'):
+        assert f'mode="social",stage="{stage}",le="+Inf"}}' in text
+    assert 'wsd_input_tokens_count{endpoint="api.analyze_social",mode="social"}' in text
+    assert 'wsd_cache_hit_rate{cache="result"}' in text
+
+def test_request_profiling(tmp_path):
+    """Test opt-in profiling of one request, stored under a generated ID"""
+    import pstats
+    from app import create_app
+    from config import Config
+
+    class ProfilingConfig(Config):
+        TESTING = True
+        PROFILING_ENABLED = True
+        PROFILING_TOKEN = 'secret'
+        PROFILE_DIR = str(tmp_path)
+
+    client = create_app(ProfilingConfig).test_client()
+    payload = {'text': 'The screen is great but the battery is bad'}
+
+    response = client.post('/api/analyze', json=payload, headers={'X-Profile': 'pstats'})
+    assert response.status_code == 403
+
+    # Client-chosen IDs are ignored, so profiles cannot be overwritten
+    headers = {'X-Profile': 'pstats', 'X-Profile-Token': 'secret', 'X-Request-ID': 'req-1'}
+    response = client.post('/api/analyze', json=payload, headers=headers)
+    assert response.status_code == 200
+    first_id = response.headers['X-Profile-Id']
+    assert first_id != 'req-1'
+    assert client.post('/api/analyze', json=payload, headers=headers).headers['X-Profile-Id'] != first_id
+    stats = pstats.Stats(str(tmp_path / f'{first_id}.pstats'))
+    assert stats.total_calls > 0
+
+    headers = {'X-Profile': 'collapsed', 'X-Profile-Token': 'secret'}
+    response = client.post('/api/analyze-product', json=payload, headers=headers)
+    profile_id = response.headers['X-Profile-Id']
+    assert response.headers['X-Profile-Format'] == 'collapsed'
+
+    response = client.get(f'/api/profiles/{profile_id}', headers={'X-Profile-Token': 'secret'})
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    for line in response.data.decode('utf-8').splitlines():
+        assert line.rsplit(' ', 1)[1].isdigit()
+
+    assert client.get(f'/api/profiles/{first_id}').status_code == 403
+    response = client.get('/api/profiles/missing', headers={'X-Profile-Token': 'secret'})
+    assert response.status_code == 404
+
+    # Without the header nothing is profiled
+    response = client.post('/api/analyze', json=payload)
+    assert 'X-Profile-Id' not in response.headers
+
+    # Enabled without a token: refused
+    ProfilingConfig.PROFILING_TOKEN = ''
+    client = create_app(ProfilingConfig).test_client()
+    response = client.post('/api/analyze', json=payload, headers={'X-Profile': 'pstats'})
+    assert response.status_code == 403
+    assert client.get(f'/api/profiles/{first_id}').status_code == 403
@@ -0,0 +1,112 @@
+"""
+ASGI Serving Tests
+"""
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add Backend to path
+backend_path = Path(__file__).parent.parent / 'Backend'
+sys.path.insert(0, str(backend_path))
+
+from app import create_app
+from asgi import AsyncGateway
+from config import Config
+
+
+def make_gateway(**limits):
+    class TestConfig(Config):
+        TESTING = True
+    return AsyncGateway(create_app(TestConfig), **limits)
+
+
+async def call(gateway, method, path, body=b'', chunks=None):
+    """Send one request to the ASGI app; returns (status, headers, body)"""
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+        'headers': [(b'content-type', b'application/json')],
+    }
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': True}
+                for chunk in (chunks or [])]
+    messages.append({'type': 'http.request', 'body': body, 'more_body': False})
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await gateway(scope, receive, send)
+    start = sent[0]
+    return (start['status'], dict(start['headers']),
+            b''.join(m.get('body', b'') for m in sent[1:]))
+
+
+def test_analyze_through_gateway():
+    """Test the Flask endpoints served over ASGI"""
+    gateway = make_gateway()
+    body = json.dumps({'text': 'This is amazing!'}).encode()
+    status, headers, data = asyncio.run(call(gateway, 'POST', '/api/analyze', body))
+    assert status == 200
+    assert json.loads(data)['success'] is True
+
+    lines = [b'"Great product"\n', b'{"id": 7, "text": "Terrible shipping"}\n']
+    status, headers, data = asyncio.run(
+        call(gateway, 'POST', '/api/analyze-stream', chunks=lines))
+    assert status == 200
+    records = [json.loads(line) for line in data.decode().splitlines()]
+    assert [r.get('id') for r in records[:2]] == [None, 7]
+    assert records[-1]['total'] == 2
+
+
+def test_overload_returns_503():
+    """Test a full analysis pool sheds load instead of queueing"""
+    gateway = make_gateway(cpu_workers=1, cpu_queue=0)
+    release = threading.Event()
+    gateway.cpu.submit(release.wait)
+    try:
+        body = json.dumps({'text': 'Fine'}).encode()
+        status, headers, data = asyncio.run(call(gateway, 'POST', '/api/analyze', body))
+        assert status == 503
+        assert headers[b'retry-after'] == b'1'
+        assert json.loads(data)['success'] is False
+        status, _, _ = asyncio.run(call(gateway, 'POST', '/api/analyze-made-up-path', body))
+        assert status == 503
+        # Health checks use the io pool and still answer
+        status, _, _ = asyncio.run(call(gateway, 'GET', '/api/health'))
+        assert status == 200
+    finally:
+        release.set()
+    assert gateway.cpu.stats()['rejected'] == 2
+    errors = gateway.services.metrics.errors
+    assert errors.value('api.analyze_general', 'overloaded') == 1
+    assert errors.value('unknown', 'overloaded') == 1
+
+
+def test_slow_fetch_does_not_block_analysis():
+    """Test analyze calls complete while a URL fetch is still pending"""
+    gateway = make_gateway(cpu_workers=1, cpu_queue=0)
+    fetching, release = threading.Event(), threading.Event()
+
+    class SlowExtractor:
+        def extract_from_url(self, url):
+            fetching.set()
+            release.wait(5)
+            return 'The battery life is great and the screen is good ' * 5
+
+    gateway.services._url_extractor = SlowExtractor()
+
+    async def scenario():
+        url_body = json.dumps({'url': 'http://slow.test/'}).encode()
+        url_call = asyncio.ensure_future(call(gateway, 'POST', '/api/analyze-url', url_body))
+        await asyncio.get_running_loop().run_in_executor(None, fetching.wait, 5)
+        status, _, _ = await call(gateway, 'POST', '/api/analyze',
+                                  json.dumps({'text': 'Quick one'}).encode())
+        assert not url_call.done()
+        release.set()
+        return status, (await url_call)[0]
+
+    assert asyncio.run(scenario()) == (200, 200)
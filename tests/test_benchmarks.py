@@ -0,0 +1,45 @@
+"""
+Benchmark harness tests (structure and regression gate, not speed)
+"""
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+import bench_pipeline
+import corpora
+
+
+def test_corpora_are_deterministic():
+    """Test synthetic corpora are reproducible and sized as documented"""
+    assert corpora.tweets(20) == corpora.tweets(20)
+    article = corpora.articles(1, words=2000)[0]
+    assert len(article.split()) >= 2000
+    assert len(corpora.load('recorded_reviews')) > 0
+
+
+def test_pipeline_report_and_gate():
+    """Test the report shape and the baseline comparison"""
+    report = bench_pipeline.run(['recorded_reviews'], repeat=1)
+    result = report['corpora']['recorded_reviews']
+    assert set(result['stages']) == set(bench_pipeline.STAGES)
+    assert set(result['end_to_end']) == set(bench_pipeline.MODES)
+    stats = result['stages']['tokenize']
+    assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+
+    rows, regressions = bench_pipeline.compare(report, report, threshold=0.2)
+    assert rows and not regressions
+
+    faster = copy.deepcopy(report)
+    for stats in faster['corpora']['recorded_reviews']['stages'].values():
+        stats['p50_ms'] = max(stats['p50_ms'], 0.01) / 2
+    _, regressions = bench_pipeline.compare(report, faster, threshold=0.2)
+    assert regressions
+
+    other = copy.deepcopy(report)
+    other['meta']['tokenizer'] = 'fast'
+    with pytest.raises(ValueError):
+        bench_pipeline.compare(other, report)
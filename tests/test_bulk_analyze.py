@@ -0,0 +1,109 @@
+"""
+Bulk Analyzer CLI Tests
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add Backend to path
+backend_path = Path(__file__).parent.parent / 'Backend'
+sys.path.insert(0, str(backend_path))
+
+from modules import bulk_analyze
+
+TEXTS = ['Great battery life', 'The screen is terrible', 'Not bad at all', 'Love it 🔥', 'Slow shipping']
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / 'input.jsonl'
+    lines = [json.dumps({'id': f'r{i}', 'text': text}) for i, text in enumerate(TEXTS * 4)]
+    lines.insert(3, 'not json')
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def read_output(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_jsonl_to_ndjson(corpus, tmp_path):
+    """Test rows are analyzed in order with row numbers, ids and errors"""
+    out = tmp_path / 'out.ndjson'
+    args = [str(corpus), '-o', str(out), '--workers', '1', '--chunk-size', '4', '--quiet']
+    assert bulk_analyze.main(args) == 0
+    records = read_output(out)
+    assert [r['row'] for r in records] == list(range(1, 22))
+    assert records[3] == {'row': 4, 'error': 'Invalid text', 'success': False}
+    assert records[0]['id'] == 'r0' and records[0]['success'] is True
+
+
+def test_csv_input(tmp_path):
+    """Test CSV rows with a header and custom text column"""
+    source = tmp_path / 'input.csv'
+    source.write_text('review_id,body\n1,"Great, fast shipping"\n2,\n', encoding='utf-8')
+    out = tmp_path / 'out.ndjson'
+    args = [str(source), '-o', str(out), '--workers', '1', '--text-field', 'body',
+            '--id-field', 'review_id', '--detail', 'minimal', '--quiet']
+    assert bulk_analyze.main(args) == 0
+    records = read_output(out)
+    assert records[0]['id'] == '1' and records[0]['success'] is True
+    assert records[1]['success'] is False
+
+
+def test_resume_from_checkpoint(corpus, tmp_path):
+    """Test an interrupted job resumes and matches an uninterrupted run"""
+    reference = tmp_path / 'reference.ndjson'
+    bulk_analyze.main([str(corpus), '-o', str(reference), '--workers', '1',
+                       '--chunk-size', '4', '--quiet'])
+
+    out, checkpoint_path = tmp_path / 'out.ndjson', tmp_path / 'job.ckpt'
+    job = {
+        'input': str(corpus), 'format': 'jsonl', 'mode': 'general',
+        'options': {'detail': 'full'}, 'chunk_size': 4, 'text_field': 'text',
+        'id_field': 'id', 'tokenizer': 'nltk',
+    }
+
+    def interrupted_rows():
+        with open(corpus, encoding='utf-8') as f:
+            for number, row in enumerate(bulk_analyze.read_rows(f), 1):
+                if number > 10:
+                    raise KeyboardInterrupt
+                yield row
+
+    checkpoint = bulk_analyze.Checkpoint(str(checkpoint_path), job)
+    bulk = bulk_analyze.BulkAnalyzer(workers=1, chunk_size=4, checkpoint=checkpoint,
+                                     checkpoint_interval=0)
+    with open(out, 'wb') as output, pytest.raises(KeyboardInterrupt):
+        bulk.run(interrupted_rows(), output)
+    # A partial record written after the checkpoint is discarded on resume
+    with open(out, 'ab') as output:
+        output.write(b'{"row": 9, "trunc')
+    assert json.loads(checkpoint_path.read_text())['rows'] == 8
+
+    args = [str(corpus), '-o', str(out), '--workers', '1', '--chunk-size', '4',
+            '--checkpoint', str(checkpoint_path), '--quiet']
+    assert bulk_analyze.main(args) == 0
+    assert out.read_bytes() == reference.read_bytes()
+
+    # A checkpoint from another job is refused
+    with pytest.raises(SystemExit):
+        bulk_analyze.main(args[:-3] + ['--mode', 'social', '--checkpoint', str(checkpoint_path)])
+    with pytest.raises(SystemExit):
+        bulk_analyze.main(args[:-3] + ['--tokenizer', 'fast', '--checkpoint', str(checkpoint_path)])
+    with pytest.raises(SystemExit):
+        bulk_analyze.main(args[:-3] + ['--id-field', 'text', '--checkpoint', str(checkpoint_path)])
+    # Stdin cannot be resumed
+    with pytest.raises(SystemExit):
+        bulk_analyze.main(['-'] + args[1:])
+
+
+def test_unordered_process_pool(corpus, tmp_path):
+    """Test parallel unordered output covers every row once"""
+    out = tmp_path / 'out.ndjson'
+    args = [str(corpus), '-o', str(out), '--workers', '2', '--chunk-size', '3',
+            '--max-in-flight', '2', '--unordered', '--detail', 'minimal', '--quiet']
+    assert bulk_analyze.main(args) == 0
+    assert sorted(r['row'] for r in read_output(out)) == list(range(1, 22))
@@ -0,0 +1,105 @@
+"""
+Incremental Analysis Tests
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add Backend to path
+backend_path = Path(__file__).parent.parent / 'Backend'
+sys.path.insert(0, str(backend_path))
+
+from core.analyzer import UniversalWSDAnalyzer
+from core.incremental import IncrementalDocument
+
+WORDS = ("the bank was not very good . I love this bright light ! but the "
+         "battery is terrible , really bad 😀 never happy cold play great").split()
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return UniversalWSDAnalyzer(cache_size=0, tokenizer='fast')
+
+
+def full_analysis(analyzer, text):
+    """Unrounded score, mean sense confidence and token count of a full pass"""
+    tokens = analyzer.scorer.prepare_tokens(analyzer.tokenizer.tokenize(text))
+    senses = analyzer.wsd.disambiguate(tokens)
+    contributions = analyzer.scorer.token_contributions(tokens, senses)
+    emojis = analyzer.lexicon.get_emoji_scanner().scan(text)
+    score = analyzer.scorer.score_contributions(contributions, emojis)
+    return score, senses.mean_confidence() if tokens else 0.0, len(tokens)
+
+
+def test_edits_match_full_analysis(analyzer):
+    """Test random edits give the same result as analyzing the new text"""
+    rng = random.Random(7)
+    document = IncrementalDocument(analyzer, '')
+    text = ''
+    for _ in range(300):
+        if not text or rng.random() < 0.6:
+            offset, delete = rng.randint(0, len(text)), 0
+            insert = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + rng.choice([' ', '', ' . '])
+        else:
+            offset = rng.randint(0, len(text) - 1)
+            delete = rng.randint(0, min(12, len(text) - offset))
+            insert = rng.choice(['', rng.choice(WORDS)])
+        text = text[:offset] + insert + text[offset + delete:]
+        document.edit(offset, delete, insert)
+
+        assert document.text == text
+        score, mean_confidence, n_tokens = full_analysis(analyzer, text)
+        units = document._count + document._emoji_count
+        incremental = (document._total + document._emoji_total) / units if units else 0.0
+        assert incremental == pytest.approx(score, abs=1e-9)
+        assert len(document._tokens) == n_tokens
+        if n_tokens:
+            assert document._confidence_total / n_tokens == pytest.approx(mean_confidence, abs=1e-9)
+
+    result = analyzer.analyze(text)
+    assert document.result()['sentiment'] == result['sentiment']
+
+
+def test_edit_outside_text(analyzer):
+    """Test edits past the end of the text are rejected"""
+    document = IncrementalDocument(analyzer, 'good')
+    with pytest.raises(ValueError):
+        document.edit(2, 5, '')
+    assert document.text == 'good'
+    assert document.version == 0
+
+
+def test_session_api():
+    """Test the live-typing session endpoints"""
+    from app import create_app
+    from config import Config
+
+    class SessionConfig(Config):
+        TESTING = True
+        TOKENIZER = 'fast'
+
+    client = create_app(SessionConfig).test_client()
+    response = client.post('/api/sessions', json={'text': 'I love it'})
+    assert response.status_code == 201
+    body = response.get_json()
+    session_id = body['session_id']
+    assert body['data']['sentiment'] == 'POSITIVE'
+
+    edit = {'offset': 2, 'delete': 4, 'insert': 'hate'}
+    response = client.post(f'/api/sessions/{session_id}/edits', json={'edits': [edit], 'version': 0})
+    assert response.status_code == 200
+    assert response.get_json()['version'] == 1
+    assert response.get_json()['data']['sentiment'] == 'NEGATIVE'
+
+    # Stale version
+    response = client.post(f'/api/sessions/{session_id}/edits', json={'edits': [edit], 'version': 0})
+    assert response.status_code == 409
+    response = client.post(f'/api/sessions/{session_id}/edits', json={'edits': [{'offset': 50}]})
+    assert response.status_code == 400
+
+    body = client.get(f'/api/sessions/{session_id}').get_json()
+    assert body['text'] == 'I hate it'
+    assert client.delete(f'/api/sessions/{session_id}').status_code == 200
+    assert client.get(f'/api/sessions/{session_id}').status_code == 404
@@ -0,0 +1,61 @@
+"""
+Unit Tests for Lexicon Tables
+"""
+import pytest
+import sys
+from pathlib import Path
+
+
+# Add Backend to path
+backend_path = Path(__file__).parent.parent / 'Backend'
+sys.path.insert(0, str(backend_path))
+
+
+from modules.lexicon_manager import LexiconManager
+from modules.lexicon_table import LexiconTable, compile_lexicon
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    source = tmp_path / 'lexicon.tsv'
+    source.write_text(
+        "# word\tscore\n"
+        "splendiferous\t1.3\n"
+        "Meh\t-0.4\n"
+        "naïve\t-0.2\n"
+        "good\t0.1\n",
+        encoding='utf-8'
+    )
+    dest = tmp_path / 'lexicon.bin'
+    assert compile_lexicon(str(source), str(dest)) == 4
+    return str(dest)
+
+
+def test_table_lookup(table_path):
+    """Test compiled table lookups without a Python dict"""
+    table = LexiconTable(table_path)
+    assert len(table) == 4
+    assert table.get('splendiferous') == 1.3
+    assert table.get('meh') == -0.4
+    assert table.get('naïve') == -0.2
+    assert table.get('unknown', 0.0) == 0.0
+    assert [word for word, _ in table.items()] == sorted(
+        ['good', 'meh', 'naïve', 'splendiferous'], key=lambda w: w.encode('utf-8')
+    )
+    table.close()
+
+
+def test_table_rejects_other_files(tmp_path):
+    """Test non-table files are refused"""
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a lexicon table at all')
+    with pytest.raises(ValueError):
+        LexiconTable(str(path))
+
+
+def test_manager_uses_table(table_path):
+    """Test built-in words win and the table fills the gaps"""
+    lexicon = LexiconManager(table_path=table_path)
+    assert lexicon.get_sentiment_score('Splendiferous!') == 1.3
+    assert lexicon.get_sentiment_score('good') == 1.0
+    assert lexicon.get_sentiment_score('table') == 0.0
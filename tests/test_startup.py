@@ -0,0 +1,92 @@
+"""
+Startup Tests - app factory, lazy subsystems and warm-up
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent / 'Backend'
+
+# Generous bounds: catch regressions (eager imports, per-request model
+# loading), not machine speed
+MAX_IMPORT_SECONDS = 5.0
+MAX_FIRST_REQUEST_MS = 500.0
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+import_seconds = time.perf_counter() - start
+lazy = [m for m in ('nltk', 'bs4', 'requests', 'numpy', 'core.analyzer') if m in sys.modules]
+
+startup = dict(app.extensions['services'].warm_up())
+client = app.test_client()
+start = time.perf_counter()
+response = client.post('/api/analyze-social', json={'text': 'Loving this new phone, battery is sick'})
+first_request_ms = (time.perf_counter() - start) * 1000
+
+print(json.dumps({
+    'import_seconds': import_seconds,
+    'loaded': lazy,
+    'startup': startup,
+    'status': response.status_code,
+    'first_request_ms': first_request_ms,
+    'url_stack': 'bs4' in sys.modules,
+}))
+"""
+
+
+def run_startup():
+    output = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT], cwd=str(backend_path),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_cold_start():
+    """Test lazy imports, the warm-up hook and first-request latency"""
+    stats = run_startup()
+    assert stats['loaded'] == []
+    assert stats['import_seconds'] < MAX_IMPORT_SECONDS
+    assert {'create_app_ms', 'analyzer_ms', 'warm_up_ms'} <= set(stats['startup'])
+    assert stats['status'] == 200
+    assert stats['first_request_ms'] < MAX_FIRST_REQUEST_MS
+    # The URL stack stays unloaded until a URL endpoint is hit
+    assert stats['url_stack'] is False
+
+
+PRELOAD_SCRIPT = """
+import gc, json, os
+from app import create_app
+app = create_app()
+services = app.extensions['services']
+startup = dict(services.preload())
+
+read_fd, write_fd = os.pipe()
+pid = os.fork()
+if pid == 0:
+    response = app.test_client().post('/api/analyze', json={'text': 'The movie was sick'})
+    os.write(write_fd, str(response.status_code).encode())
+    os._exit(0)
+os.waitpid(pid, 0)
+print(json.dumps({
+    'startup': startup,
+    'frozen_objects': gc.get_freeze_count(),
+    'child_status': int(os.read(read_fd, 16)),
+}))
+"""
+
+
+def test_preload_before_fork():
+    """Test the master-side preload freezes the tables and forked workers serve"""
+    output = subprocess.run(
+        [sys.executable, '-c', PRELOAD_SCRIPT], cwd=str(backend_path),
+        capture_output=True, text=True, check=True
+    ).stdout
+    stats = json.loads(output.strip().splitlines()[-1])
+    assert {'warm_up_ms', 'preload_ms'} <= set(stats['startup'])
+    assert stats['frozen_objects'] > 0
+    assert stats['child_status'] == 200
@@ -0,0 +1,84 @@
+"""
+Unit Tests for Tokenizers
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add Backend to path
+backend_path = Path(__file__).parent.parent / 'Backend'
+sys.path.insert(0, str(backend_path))
+
+from nltk.tokenize import word_tokenize
+from core.analyzer import UniversalWSDAnalyzer
+from core.tokenizer import FastTokenizer, get_tokenizer
+
+CORPUS = [
+    "This product is amazing! I love it so much.",
+    "Terrible quality, broke after 2 days. Never buying again!!!",
+    "The movie was sick bro 🔥🔥 #mustwatch @netflix",
+    "I don't like the battery, but the screen is great.",
+    "It's okay... not great, not terrible.",
+    "Price: $49.99 (on sale) - worth it? Absolutely.",
+    "\"Best purchase ever\" said nobody. 1/10 would not recommend.",
+    "Arrived at 10:30, packaging was damaged; seller didn't respond.",
+    "Can't believe how fast shipping was!! 5 stars :)",
+    "wait... what?! the update broke everything [again]",
+    "Sizing runs small -- order one size up.",
+    "Check https://example.com/review?id=42 for the full review.",
+    "Rock'n'roll vibes, 100% recommend & will buy again.",
+    "I cannot recommend this enough; it's the best!",
+    "Customer service was rude... won't be back 😡",
+    "The U.S.A. version ships with 2 chargers.",
+    "gonna return it, wanna try the other one",
+    "Hmm, it works I guess. Meh.",
+    "Love love LOVE this jacket!!! Fits perfectly <3",
+    "Battery life: 12 hours; screen: 6.1 inches; weight: 180g.",
+    "'Fine' is the word I'd use. Nothing special.",
+    "My kids' favourite toy {seriously}",
+    "Not bad at all, really cool design.",
+    "Fire beat 🔥 #music #newrelease",
+    "Is it worth $1,299? Hardly.",
+]
+
+# NLTK splits these clitics and fused words off; the fast tokenizer keeps them whole
+CLITICS = {"n't", "'s", "'m", "'d", "'re", "'ve", "'ll"}
+FUSED = {('can', 'not'), ('gon', 'na'), ('wan', 'na'), ('got', 'ta'),
+         ('gim', 'me'), ('lem', 'me')}
+
+
+def merge_contractions(tokens):
+    merged = []
+    for token in tokens:
+        if merged and (token.lower() in CLITICS
+                       or (merged[-1].lower(), token.lower()) in FUSED):
+            merged[-1] += token
+        else:
+            merged.append(token)
+    return merged
+
+
+def test_fast_tokenizer_parity():
+    """Test the fast tokenizer against NLTK on a review/social corpus"""
+    fast = FastTokenizer()
+    for text in CORPUS:
+        assert fast.tokenize(text) == merge_contractions(word_tokenize(text)), text
+
+
+def test_fast_tokenizer_contractions():
+    """Test contractions are kept whole for negation"""
+    tokens = FastTokenizer().tokenize("I don't like it, can't say I do")
+    assert "don't" in tokens and "can't" in tokens
+
+    analyzer = UniversalWSDAnalyzer(tokenizer='fast')
+    assert analyzer.analyze("I don't love it")['score'] < 0
+    assert analyzer.analyze("It isn't good")['score'] < 0
+
+
+def test_get_tokenizer():
+    """Test tokenizer lookup by name or object"""
+    assert get_tokenizer('fast').name == 'fast'
+    fast = FastTokenizer()
+    assert get_tokenizer(fast) is fast
+    with pytest.raises(ValueError):
+        get_tokenizer('whitespace')
@@ -0,0 +1,234 @@
+"""
+URL extraction tests against a local stand-in HTTP server
+"""
+import pytest
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add Backend to path
+backend_path = Path(__file__).parent.parent / 'Backend'
+sys.path.insert(0, str(backend_path))
+
+from modules.url_extractor import URLTextExtractor
+from modules.url_batch import URLBatchAnalyzer
+from modules.fetch_cache import FetchCache
+
+ARTICLE = (
+    "<html><body><nav>Home About</nav><article><p>"
+    + "This product is amazing and the battery life is excellent. " * 10
+    + "</p></article></body></html>"
+)
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves ARTICLE after a short delay, tracking concurrency"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.connections.add(self.client_address)
+            server.requests += 1
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+
+        headers = {}
+        if self.path.startswith('/missing'):
+            body, status = b'not found', 404
+        elif self.path.startswith('/etag'):
+            headers = {'ETag': '"v1"', 'Cache-Control': 'no-cache'}
+            if self.headers.get('If-None-Match') == '"v1"':
+                body, status = b'', 304
+            else:
+                body, status = ARTICLE.encode('utf-8'), 200
+        elif self.path.startswith('/fresh'):
+            headers = {'Cache-Control': 'max-age=60'}
+            body, status = ARTICLE.encode('utf-8'), 200
+        else:
+            body, status = ARTICLE.encode('utf-8'), 200
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.active = 0
+    httpd.peak = 0
+    httpd.delay = 0.05
+    httpd.connections = set()
+    httpd.requests = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_session_reuses_connections(server):
+    """Test that repeat fetches share one pooled connection"""
+    extractor = URLTextExtractor()
+    for i in range(3):
+        assert 'battery life' in extractor.extract_from_url(f'{base_url(server)}/page{i}')
+    extractor.close()
+    assert len(server.connections) == 1
+
+
+def test_batch_per_host_limit(server):
+    """Test concurrent fetching respects the per-host limit and keeps order"""
+    extractor = URLTextExtractor()
+    urls = [f'{base_url(server)}/page{i}' for i in range(8)] + [f'{base_url(server)}/missing']
+    batch = URLBatchAnalyzer(extractor, max_workers=8, per_host=2)
+    results = batch.run(urls, lambda url, text: {'success': True, 'words': len(text.split())})
+    batch.close()
+    extractor.close()
+
+    assert [r['url'] for r in results] == urls
+    assert all(r['success'] for r in results[:-1])
+    assert results[-1]['success'] is False
+    assert set(results[0]['timings']) == {'fetch_ms', 'extract_ms', 'analyze_ms', 'cached'}
+    assert 1 < server.peak <= 2
+
+
+def test_batch_limits_shared_across_requests(server):
+    """Test concurrent batches share the global and per-host limits"""
+    extractor = URLTextExtractor()
+    batch = URLBatchAnalyzer(extractor, max_workers=8, per_host=2)
+    urls = [f'{base_url(server)}/page{i}' for i in range(6)]
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.extend(batch.run(urls, lambda url, text: {})))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    batch.close()
+    extractor.close()
+
+    assert len(results) == 18
+    assert 1 < server.peak <= 2
+    assert batch._hosts == {}
+
+
+def test_analyze_urls_endpoint(server, tmp_path):
+    """Test the multi-URL endpoint"""
+    from app import create_app
+    from config import Config
+
+    class URLConfig(Config):
+        TESTING = True
+        FETCH_CACHE_DIR = str(tmp_path)
+
+    urls = [f'{base_url(server)}/a', f'{base_url(server)}/b']
+    with create_app(URLConfig).test_client() as client:
+        response = client.post('/api/analyze-urls', json={'urls': urls})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['total'] == 2
+    assert data['summary']['positive'] == 2
+    assert data['results'][0]['data']['source_url'] == urls[0]
+
+
+def no_parsing(html):
+    raise AssertionError('page was parsed again')
+
+
+def test_fetch_cache_fresh_hit(server, tmp_path):
+    """Test that a fresh cache entry skips the request and parsing"""
+    extractor = URLTextExtractor(cache=FetchCache(str(tmp_path)))
+    url = f'{base_url(server)}/fresh'
+    text = extractor.extract_from_url(url)
+    extractor.extract_main_text = no_parsing
+    assert extractor.extract_from_url(url) == text
+    assert server.requests == 1
+    assert extractor.cache.stats()['hits'] == 1
+
+
+def test_fetch_cache_revalidation(server, tmp_path):
+    """Test that a 304 Not Modified reuses the cached text"""
+    extractor = URLTextExtractor(cache=FetchCache(str(tmp_path)))
+    url = f'{base_url(server)}/etag'
+    text = extractor.extract_from_url(url)
+    extractor.extract_main_text = no_parsing
+    assert extractor.extract_from_url(url) == text
+    assert server.requests == 2
+    assert extractor.cache.stats()['revalidated'] == 1
+
+    # The cache survives a restart
+    assert FetchCache(str(tmp_path)).get(url).etag == '"v1"'
+
+
+def test_fetch_cache_eviction(server, tmp_path):
+    """Test that the size limit evicts least recently used pages"""
+    cache = FetchCache(str(tmp_path), max_bytes=len(ARTICLE) * 3)
+    extractor = URLTextExtractor(cache=cache)
+    urls = [f'{base_url(server)}/fresh{i}' for i in range(4)]
+    for url in urls:
+        extractor.extract_from_url(url)
+    assert cache.stats()['bytes'] <= len(ARTICLE) * 3
+    assert cache.get(urls[0]) is None
+    assert cache.get(urls[-1]) is not None
+    assert not list(tmp_path.glob('*.html'))
+
+
+def test_fetch_cache_shared_directory(server, tmp_path):
+    """Test workers sharing a cache directory keep it under one size limit"""
+    limit = len(ARTICLE) * 3
+    workers = [URLTextExtractor(cache=FetchCache(str(tmp_path), max_bytes=limit)) for _ in range(2)]
+    urls = [f'{base_url(server)}/fresh{i}' for i in range(6)]
+    for i, url in enumerate(urls):
+        workers[i % 2].extract_from_url(url)
+    on_disk = sum(path.stat().st_size for path in tmp_path.iterdir())
+    assert on_disk <= limit
+    # Entries written by one worker are hits for the other
+    assert workers[1].cache.get(urls[-2]) is not None
+
+
+def test_extract_main_content():
+    """Test container choice, tie-breaking, link density and fallback"""
+    extractor = URLTextExtractor()
+    body = " ".join(["word"] * 50)
+    html = (
+        "<html><body><div class='post'><div class='content'>"
+        f"<p>{body}</p><a href='/x'>one two three four five</a>"
+        "</div></div><main><p>short</p></main></body></html>"
+    )
+    content = extractor.extract_main_content(html)
+    # Both divs hold 55 words; div[class*=content] comes before div[class*=post]
+    assert content['selector'] == 'div[class*=content]'
+    assert content['words'] == 55
+    assert content['link_density'] == round(5 / 55, 3)
+
+    fallback = "<html><body><p>one two three four five six</p><p>too short</p></body></html>"
+    assert extractor.extract_main_text(fallback) == "one two three four five six"
+
+
+def test_extract_max_html_bytes():
+    """Test that oversized pages are truncated before parsing"""
+    extractor = URLTextExtractor(max_html_bytes=200)
+    html = "<article><p>" + "word " * 1000 + "</p></article>"
+    assert len(extractor.extract_main_text(html).split()) < 50